@@ -645,6 +645,27 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
 )
 
 
+AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND = os.environ.get(
+    "AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND", "5"
+)
+
+if AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND == "":
+    AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND = None
+else:
+    try:
+        AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND = int(AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND)
+    except Exception:
+        AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND = 5
+
+
+GOOGLE_DRIVE_SYNC_CONCURRENCY = os.environ.get("GOOGLE_DRIVE_SYNC_CONCURRENCY", "10")
+
+try:
+    GOOGLE_DRIVE_SYNC_CONCURRENCY = max(int(GOOGLE_DRIVE_SYNC_CONCURRENCY), 1)
+except ValueError:
+    GOOGLE_DRIVE_SYNC_CONCURRENCY = 10
+
+
 ####################################
 # SENTENCE TRANSFORMERS
 ####################################
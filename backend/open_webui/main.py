@@ -607,6 +607,10 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    # Start the batched flow execution writer
+    from open_webui.utils.flow_executions import start_flow_execution_writer
+    start_flow_execution_writer()
+
     # Start the scheduled prompts scheduler
     from open_webui.utils.scheduler import start_scheduler
     start_scheduler(app)
@@ -635,8 +639,13 @@ async def lifespan(app: FastAPI):
     yield
 
     # Stop the scheduled prompts scheduler
-    from open_webui.utils.scheduler import stop_scheduler
+    from open_webui.utils.scheduler import close_http_session, stop_scheduler
     stop_scheduler()
+    await close_http_session()
+
+    # Flush queued flow executions
+    from open_webui.utils.flow_executions import stop_flow_execution_writer
+    await stop_flow_execution_writer()
 
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
@@ -0,0 +1,34 @@
+"""Add user_id/updated_at index to file
+
+Revision ID: i2k3l4m5n6o7
+Revises: h1j2k3l4m5n6
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "i2k3l4m5n6o7"
+down_revision = "h1j2k3l4m5n6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [index["name"] for index in inspector.get_indexes("file")]
+
+    if "file_user_id_updated_at_idx" not in indexes:
+        op.create_index("file_user_id_updated_at_idx", "file", ["user_id", "updated_at"])
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [index["name"] for index in inspector.get_indexes("file")]
+
+    if "file_user_id_updated_at_idx" in indexes:
+        op.drop_index("file_user_id_updated_at_idx", table_name="file")
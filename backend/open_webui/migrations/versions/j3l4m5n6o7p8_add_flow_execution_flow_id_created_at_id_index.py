@@ -0,0 +1,52 @@
+"""Extend flow_execution flow_id/created_at index with id
+
+Revision ID: j3l4m5n6o7p8
+Revises: i2k3l4m5n6o7
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "j3l4m5n6o7p8"
+down_revision = "i2k3l4m5n6o7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [index["name"] for index in inspector.get_indexes("flow_execution")]
+
+    # (flow_id, created_at, id) matches the execution history ORDER BY exactly,
+    # including the id tie-breaker, and supersedes the (flow_id, created_at) index
+    if "flow_execution_flow_id_created_at_id_idx" not in indexes:
+        op.create_index(
+            "flow_execution_flow_id_created_at_id_idx",
+            "flow_execution",
+            ["flow_id", "created_at", "id"],
+        )
+
+    if "flow_execution_flow_id_created_at_idx" in indexes:
+        op.drop_index("flow_execution_flow_id_created_at_idx", table_name="flow_execution")
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [index["name"] for index in inspector.get_indexes("flow_execution")]
+
+    if "flow_execution_flow_id_created_at_idx" not in indexes:
+        op.create_index(
+            "flow_execution_flow_id_created_at_idx",
+            "flow_execution",
+            ["flow_id", "created_at"],
+        )
+
+    if "flow_execution_flow_id_created_at_id_idx" in indexes:
+        op.drop_index(
+            "flow_execution_flow_id_created_at_id_idx", table_name="flow_execution"
+        )
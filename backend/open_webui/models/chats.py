@@ -615,6 +615,39 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def get_chats_meta(self) -> list:
+        """
+        Get lightweight chat rows without the (potentially large) chat JSON.
+
+        Returns:
+            list of rows with id, user_id, archived, pinned and updated_at
+        """
+        with get_db() as db:
+            return (
+                db.query(
+                    Chat.id, Chat.user_id, Chat.archived, Chat.pinned, Chat.updated_at
+                )
+                .order_by(Chat.updated_at.desc())
+                .all()
+            )
+
+    def iter_chat_json(self, updated_since: Optional[int] = None):
+        """
+        Stream chat JSON without materializing every chat at once.
+
+        Args:
+            updated_since: Only yield chats updated at or after this timestamp
+
+        Yields:
+            rows with id, user_id and chat
+        """
+        with get_db() as db:
+            query = db.query(Chat.id, Chat.user_id, Chat.chat)
+            if updated_since is not None:
+                query = query.filter(Chat.updated_at >= updated_since)
+
+            yield from query.execution_options(stream_results=True).yield_per(256)
+
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
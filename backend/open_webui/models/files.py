@@ -4,12 +4,15 @@ from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.file_status import publish_file_status
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, String, Text, JSON, Index, or_, update
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+MEDIA_CONTENT_TYPE_PREFIXES = ("image/", "video/", "audio/")
+
 ####################
 # Files DB Schema
 ####################
@@ -32,6 +35,11 @@ class File(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE user_id = ... ORDER BY updated_at DESC
+        Index("file_user_id_updated_at_idx", "user_id", "updated_at"),
+    )
+
 
 class FileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -204,6 +212,47 @@ class FilesTable:
                 for file in db.query(File).filter_by(user_id=user_id).all()
             ]
 
+    def get_media_files_by_user_id(
+        self, user_id: str, prefixes: tuple[str, ...] = MEDIA_CONTENT_TYPE_PREFIXES
+    ) -> list[FileModel]:
+        # Filter on meta.content_type in SQL instead of loading every file; the
+        # (user_id, updated_at) index narrows the scan to the user's rows in order
+        content_type = File.meta["content_type"].as_string()
+        with get_db() as db:
+            return [
+                FileModel.model_validate(file)
+                for file in db.query(File)
+                .filter_by(user_id=user_id)
+                .filter(or_(*[content_type.like(f"{prefix}%") for prefix in prefixes]))
+                .order_by(File.updated_at.desc())
+                .all()
+            ]
+
+    def get_files_by_user_id_and_source(
+        self,
+        user_id: str,
+        source: str,
+        after_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[FileModel]:
+        # Uploads record their origin (e.g. "google_drive") under meta.data.source;
+        # the user_id predicate is served by the (user_id, updated_at) index.
+        # Ordered by id, so after_id/limit page through the files
+        with get_db() as db:
+            query = (
+                db.query(File)
+                .filter_by(user_id=user_id)
+                .filter(File.meta[("data", "source")].as_string() == source)
+            )
+            if after_id is not None:
+                query = query.filter(File.id > after_id)
+
+            query = query.order_by(File.id)
+            if limit is not None:
+                query = query.limit(limit)
+
+            return [FileModel.model_validate(file) for file in query.all()]
+
     def update_file_hash_by_id(self, id: str, hash: str) -> Optional[FileModel]:
         with get_db() as db:
             try:
@@ -233,6 +282,10 @@ class FilesTable:
                 file = db.query(File).filter_by(id=id).first()
                 file.data = {**(file.data if file.data else {}), **data}
                 db.commit()
+
+                if "status" in data:
+                    publish_file_status(id, file.data)
+
                 return FileModel.model_validate(file)
             except Exception as e:
 
@@ -248,6 +301,24 @@ class FilesTable:
             except Exception:
                 return None
 
+    def update_file_metadata_by_ids(self, metas: dict[str, dict]) -> bool:
+        # Overwrites meta for every file id in a single executemany UPDATE,
+        # callers pass the full (already merged) meta dict per file
+        if not metas:
+            return True
+
+        with get_db() as db:
+            try:
+                db.execute(
+                    update(File),
+                    [{"id": id, "meta": meta} for id, meta in metas.items()],
+                )
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Error updating file metadata: {e}")
+                return False
+
     def delete_file_by_id(self, id: str) -> bool:
         with get_db() as db:
             try:
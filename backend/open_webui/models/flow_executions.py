@@ -1,15 +1,15 @@
 import logging
-import json
 import time
 import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.models.flows import Flow
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON, Index
-from sqlalchemy import or_, func, select
+from sqlalchemy import and_, case, or_, func, insert, select
 
 ####################
 # FlowExecution DB Schema
@@ -18,6 +18,9 @@ from sqlalchemy import or_, func, select
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+# Rows removed per DELETE statement when clearing a flow's execution history
+DELETE_CHUNK_SIZE = 10000
+
 
 class FlowExecution(Base):
     __tablename__ = "flow_execution"
@@ -39,7 +42,9 @@ class FlowExecution(Base):
 
     __table_args__ = (
         # Performance indexes for common queries
-        Index("flow_execution_flow_id_created_at_idx", "flow_id", "created_at"),
+        Index(
+            "flow_execution_flow_id_created_at_id_idx", "flow_id", "created_at", "id"
+        ),
         Index("flow_execution_user_id_created_at_idx", "user_id", "created_at"),
         Index("flow_execution_flow_id_status_idx", "flow_id", "status"),
     )
@@ -111,33 +116,45 @@ class FlowExecutionStatsResponse(BaseModel):
 
 
 class FlowExecutionTable:
-    def insert_new_execution(
+    def build_new_execution(
         self, user_id: str, form_data: FlowExecutionForm
-    ) -> Optional[FlowExecutionModel]:
-        with get_db() as db:
-            id = str(uuid.uuid4())
-            
-            execution = FlowExecutionModel(
-                **{
-                    "id": id,
-                    "flow_id": form_data.flow_id,
-                    "user_id": user_id,
-                    "status": form_data.status,
-                    "inputs": form_data.inputs,
-                    "outputs": form_data.outputs,
-                    "node_results": form_data.node_results,
-                    "errors": form_data.errors,
-                    "execution_time": form_data.execution_time,
-                    "created_at": int(time.time()),
-                    "meta": {},
-                }
-            )
+    ) -> FlowExecutionModel:
+        """Build the execution record for form_data, with a new id, without saving it"""
+        return FlowExecutionModel(
+            **{
+                "id": str(uuid.uuid4()),
+                "flow_id": form_data.flow_id,
+                "user_id": user_id,
+                "status": form_data.status,
+                "inputs": form_data.inputs,
+                "outputs": form_data.outputs,
+                "node_results": form_data.node_results,
+                "errors": form_data.errors,
+                "execution_time": form_data.execution_time,
+                "created_at": int(time.time()),
+                "meta": {},
+            }
+        )
+
+    def insert_executions(self, executions: list[FlowExecutionModel]) -> None:
+        """
+        Insert already built executions in a single executemany INSERT and commit.
+        Raises on failure (nothing is saved then), so the caller can tell a bad
+        row (IntegrityError) from a transient database error.
+        """
+        if not executions:
+            return
 
-            result = FlowExecution(**execution.model_dump())
-            db.add(result)
-            db.commit()
-            db.refresh(result)
-            return FlowExecutionModel.model_validate(result) if result else None
+        with get_db() as db:
+            try:
+                db.execute(
+                    insert(FlowExecution),
+                    [execution.model_dump() for execution in executions],
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
 
     def get_executions_by_flow_id(
         self, flow_id: str, skip: int = 0, limit: int = 60
@@ -146,13 +163,56 @@ class FlowExecutionTable:
             executions = (
                 db.query(FlowExecution)
                 .filter(FlowExecution.flow_id == flow_id)
-                .order_by(FlowExecution.created_at.desc())
+                .order_by(FlowExecution.created_at.desc(), FlowExecution.id.desc())
                 .offset(skip)
                 .limit(limit)
                 .all()
             )
             return [FlowExecutionModel.model_validate(execution) for execution in executions]
 
+    def get_execution_list_by_flow_id(
+        self,
+        flow_id: str,
+        skip: int = 0,
+        limit: int = 60,
+        cursor_created_at: Optional[int] = None,
+        cursor_id: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Execution history rows for list responses, as plain dicts of the
+        FlowExecutionListResponse columns only. Skips loading the large JSON
+        columns and building ORM/Pydantic objects per row.
+        Pass a cursor for keyset pagination, otherwise skip is used as an offset.
+        """
+        query = (
+            select(
+                FlowExecution.id,
+                FlowExecution.flow_id,
+                FlowExecution.status,
+                FlowExecution.execution_time,
+                FlowExecution.created_at,
+            )
+            .where(FlowExecution.flow_id == flow_id)
+            .order_by(FlowExecution.created_at.desc(), FlowExecution.id.desc())
+            .limit(limit)
+        )
+
+        if cursor_created_at is not None and cursor_id is not None:
+            query = query.where(
+                or_(
+                    FlowExecution.created_at < cursor_created_at,
+                    and_(
+                        FlowExecution.created_at == cursor_created_at,
+                        FlowExecution.id < cursor_id,
+                    ),
+                )
+            )
+        elif skip:
+            query = query.offset(skip)
+
+        with get_db() as db:
+            return [dict(row) for row in db.execute(query).mappings()]
+
     def get_executions_by_user_id(
         self, user_id: str, skip: int = 0, limit: int = 60
     ) -> list[FlowExecutionModel]:
@@ -172,67 +232,91 @@ class FlowExecutionTable:
             execution = db.query(FlowExecution).filter(FlowExecution.id == id).first()
             return FlowExecutionModel.model_validate(execution) if execution else None
 
-    def get_execution_by_id_and_user_id(
-        self, id: str, user_id: str
+    def get_execution_by_id_and_flow_id(
+        self, id: str, flow_id: str
     ) -> Optional[FlowExecutionModel]:
         with get_db() as db:
             execution = (
                 db.query(FlowExecution)
-                .filter(FlowExecution.id == id, FlowExecution.user_id == user_id)
+                .filter(FlowExecution.id == id, FlowExecution.flow_id == flow_id)
                 .first()
             )
             return FlowExecutionModel.model_validate(execution) if execution else None
 
-    def get_execution_stats_by_flow_id(
-        self, flow_id: str
-    ) -> FlowExecutionStatsResponse:
+    def _flow_owner_filter(self, flow_id: str, user_id: str, is_admin: bool) -> tuple:
+        # Executions of the flow, restricted to flows owned by the user unless admin
+        if is_admin:
+            return (FlowExecution.flow_id == flow_id,)
+        return (
+            FlowExecution.flow_id == flow_id,
+            select(Flow.id)
+            .where(Flow.id == flow_id, Flow.user_id == user_id)
+            .exists(),
+        )
+
+    def get_execution_for_user(
+        self, id: str, flow_id: str, user_id: str, is_admin: bool
+    ) -> Optional[FlowExecutionModel]:
+        """
+        Get an execution of a flow in one query, only if the flow is owned by
+        the user (or the user is an admin). Returns None otherwise.
+        """
         with get_db() as db:
-            total = (
-                db.query(func.count(FlowExecution.id))
-                .filter(FlowExecution.flow_id == flow_id)
-                .scalar()
-            )
-            
-            success_count = (
-                db.query(func.count(FlowExecution.id))
-                .filter(FlowExecution.flow_id == flow_id, FlowExecution.status == "success")
-                .scalar()
-            )
-            
-            error_count = (
-                db.query(func.count(FlowExecution.id))
-                .filter(FlowExecution.flow_id == flow_id, FlowExecution.status == "error")
-                .scalar()
-            )
-            
-            aborted_count = (
-                db.query(func.count(FlowExecution.id))
-                .filter(FlowExecution.flow_id == flow_id, FlowExecution.status == "aborted")
-                .scalar()
+            query = db.query(FlowExecution).filter(
+                FlowExecution.id == id, FlowExecution.flow_id == flow_id
             )
-            
-            avg_time = (
-                db.query(func.avg(FlowExecution.execution_time))
-                .filter(FlowExecution.flow_id == flow_id)
-                .scalar()
-            ) or 0.0
-            
-            last_execution = (
+            if not is_admin:
+                query = query.join(Flow, Flow.id == FlowExecution.flow_id).filter(
+                    Flow.user_id == user_id
+                )
+
+            execution = query.first()
+            return FlowExecutionModel.model_validate(execution) if execution else None
+
+    def get_execution_by_id_and_user_id(
+        self, id: str, user_id: str
+    ) -> Optional[FlowExecutionModel]:
+        with get_db() as db:
+            execution = (
                 db.query(FlowExecution)
-                .filter(FlowExecution.flow_id == flow_id)
-                .order_by(FlowExecution.created_at.desc())
+                .filter(FlowExecution.id == id, FlowExecution.user_id == user_id)
                 .first()
             )
-            
-            return FlowExecutionStatsResponse(
-                total_executions=total or 0,
-                success_count=success_count or 0,
-                error_count=error_count or 0,
-                aborted_count=aborted_count or 0,
-                avg_execution_time=float(avg_time),
-                last_execution_at=last_execution.created_at if last_execution else None
+            return FlowExecutionModel.model_validate(execution) if execution else None
+
+    def get_execution_stats_by_flow_id(self, flow_id: str) -> dict:
+        """
+        FlowExecutionStatsResponse fields as a plain dict. The aggregates are
+        cast explicitly, Postgres returns SUM/AVG as Decimal.
+        """
+
+        def count_status(status: str):
+            return func.sum(case((FlowExecution.status == status, 1), else_=0))
+
+        with get_db() as db:
+            # All counters in a single pass over the flow's executions
+            total, success_count, error_count, aborted_count, avg_time, last_at = (
+                db.query(
+                    func.count(FlowExecution.id),
+                    count_status("success"),
+                    count_status("error"),
+                    count_status("aborted"),
+                    func.avg(FlowExecution.execution_time),
+                    func.max(FlowExecution.created_at),
+                )
+                .filter(FlowExecution.flow_id == flow_id)
+                .one()
             )
 
+            return {
+                "total_executions": int(total or 0),
+                "success_count": int(success_count or 0),
+                "error_count": int(error_count or 0),
+                "aborted_count": int(aborted_count or 0),
+                "avg_execution_time": float(avg_time or 0.0),
+                "last_execution_at": last_at,
+            }
+
     def delete_execution_by_id(self, id: str) -> bool:
         with get_db() as db:
             execution = db.query(FlowExecution).filter(FlowExecution.id == id).first()
@@ -244,10 +328,73 @@ class FlowExecutionTable:
             db.commit()
             return True
 
-    def delete_executions_by_flow_id(self, flow_id: str) -> bool:
+    def delete_execution_by_id_and_flow_id(self, id: str, flow_id: str) -> bool:
+        with get_db() as db:
+            deleted = (
+                db.query(FlowExecution)
+                .filter(FlowExecution.id == id, FlowExecution.flow_id == flow_id)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted > 0
+
+    def delete_execution_by_id_for_user(
+        self, id: str, flow_id: str, user_id: str, is_admin: bool
+    ) -> bool:
+        """
+        Delete an execution of a flow in one statement, only if the flow is owned
+        by the user (or the user is an admin). Returns False when nothing was deleted.
+        """
         with get_db() as db:
-            db.query(FlowExecution).filter(FlowExecution.flow_id == flow_id).delete()
+            deleted = (
+                db.query(FlowExecution)
+                .filter(
+                    FlowExecution.id == id,
+                    *self._flow_owner_filter(flow_id, user_id, is_admin),
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted > 0
+
+    def _delete_executions_in_chunks(self, db, filters: tuple) -> int:
+        # Delete matching executions DELETE_CHUNK_SIZE rows per statement and
+        # commit in between, so deleting a long history never holds its locks
+        # for one huge statement. Returns the number of deleted rows
+        deleted = 0
+        while True:
+            ids = (
+                db.execute(
+                    select(FlowExecution.id).where(*filters).limit(DELETE_CHUNK_SIZE)
+                )
+                .scalars()
+                .all()
+            )
+            if not ids:
+                return deleted
+
+            db.query(FlowExecution).filter(FlowExecution.id.in_(ids)).delete(
+                synchronize_session=False
+            )
             db.commit()
+            deleted += len(ids)
+
+    def delete_executions_by_flow_id_for_user(
+        self, flow_id: str, user_id: str, is_admin: bool
+    ) -> bool:
+        """
+        Delete all executions of a flow, only if the flow is owned by the user
+        (or the user is an admin). Returns False when nothing was deleted.
+        """
+        with get_db() as db:
+            deleted = self._delete_executions_in_chunks(
+                db, self._flow_owner_filter(flow_id, user_id, is_admin)
+            )
+            return deleted > 0
+
+    def delete_executions_by_flow_id(self, flow_id: str) -> bool:
+        with get_db() as db:
+            self._delete_executions_in_chunks(db, (FlowExecution.flow_id == flow_id,))
             return True
 
     def delete_executions_by_user_id(self, user_id: str) -> bool:
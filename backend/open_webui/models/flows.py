@@ -1,8 +1,8 @@
 import logging
-import json
+import threading
 import time
 import uuid
-from typing import Optional
+from typing import Optional, TypedDict
 
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
@@ -12,7 +12,7 @@ from open_webui.utils.access_control import has_access
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON, Index
-from sqlalchemy import or_, func, select
+from sqlalchemy import and_, cast, insert, literal, or_, select
 
 ####################
 # Flow DB Schema
@@ -21,6 +21,67 @@ from sqlalchemy import or_, func, select
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+# Flows are read on every request to authorize it but rarely change; keep a
+# short-lived per-process copy of their content. Owner and access_control are
+# always read from the database (see get_flow_by_id), so a permission change
+# or delete on another worker applies at once; the TTL only bounds how long a
+# same-second edit made elsewhere can be served stale
+FLOW_CACHE_TTL = 30
+FLOW_CACHE_MAX_SIZE = 4096
+FLOW_CACHE_SEGMENTS = 16
+
+
+class FlowCache:
+    """
+    Read-optimized TTL cache. Reads are a lock-free lookup in the current
+    snapshot of a segment; writers copy the segment under a lock, modify the
+    copy and swap it in, so a published segment is never mutated. Segmenting
+    by key keeps the copy per write small.
+    """
+
+    def __init__(self, ttl: int, max_size: int, segments: int = FLOW_CACHE_SEGMENTS):
+        self.ttl = ttl
+        self.max_segment_size = max(1, max_size // segments)
+        self._segments: list[dict[str, tuple[float, "FlowModel"]]] = [
+            {} for _ in range(segments)
+        ]
+        self._lock = threading.Lock()
+
+    def _index(self, id: str) -> int:
+        return hash(id) % len(self._segments)
+
+    def get(self, id: str) -> Optional["FlowModel"]:
+        cached = self._segments[self._index(id)].get(id)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        return None
+
+    def set(self, id: str, flow: "FlowModel") -> None:
+        index = self._index(id)
+        with self._lock:
+            segment = dict(self._segments[index])
+            segment.pop(id, None)
+            if len(segment) >= self.max_segment_size:
+                # Evict the oldest entry
+                segment.pop(next(iter(segment)))
+            segment[id] = (time.monotonic(), flow)
+            self._segments[index] = segment
+
+    def pop(self, id: str) -> None:
+        index = self._index(id)
+        with self._lock:
+            if id in self._segments[index]:
+                segment = dict(self._segments[index])
+                del segment[id]
+                self._segments[index] = segment
+
+    def clear(self) -> None:
+        with self._lock:
+            self._segments = [{} for _ in self._segments]
+
+
+_flow_cache = FlowCache(FLOW_CACHE_TTL, FLOW_CACHE_MAX_SIZE)
+
 
 class Flow(Base):
     __tablename__ = "flow"
@@ -94,6 +155,20 @@ class FlowForm(BaseModel):
     access_control: Optional[dict] = None
 
 
+class FlowImportForm(TypedDict, total=False):
+    """
+    Shape of an imported flow document, either bare or wrapped as
+    {"flow": {...}} by export. Only a type hint for the parsed body; the
+    fields are validated once, when the flow is inserted.
+    """
+
+    flow: dict
+    name: str
+    description: Optional[str]
+    nodes: list
+    edges: list
+
+
 class FlowUpdateForm(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -132,6 +207,16 @@ class FlowListResponse(BaseModel):
     access_control: Optional[dict] = None
 
 
+class FlowSummaryResponse(BaseModel):
+    id: str
+    name: str
+    description: Optional[str] = None
+    created_at: int
+    updated_at: int
+    meta: dict = {}
+    access_control: Optional[dict] = None
+
+
 class FlowTable:
     def insert_new_flow(
         self, user_id: str, form_data: FlowForm
@@ -158,7 +243,12 @@ class FlowTable:
             db.add(result)
             db.commit()
             db.refresh(result)
-            return FlowModel.model_validate(result) if result else None
+            if not result:
+                return None
+
+            flow = FlowModel.model_validate(result)
+            _flow_cache.set(flow.id, flow)
+            return flow
 
     def get_flows(self) -> list[FlowUserResponse]:
         """Get all flows with user information"""
@@ -190,19 +280,134 @@ class FlowTable:
         Returns flows the user owns OR has access to via access_control.
         """
         flows = self.get_flows()
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
 
-        return [
-            flow
-            for flow in flows
-            if flow.user_id == user_id
-            or has_access(user_id, permission, flow.access_control, user_group_ids)
-        ]
+        # Group memberships are only needed for flows shared via access_control,
+        # load them at most once and only if such a flow is encountered
+        user_group_ids = None
+        accessible_flows = []
+        for flow in flows:
+            if flow.user_id != user_id:
+                if flow.access_control is not None and user_group_ids is None:
+                    user_group_ids = {
+                        group.id for group in Groups.get_groups_by_member_id(user_id)
+                    }
+                if not has_access(
+                    user_id, permission, flow.access_control, user_group_ids
+                ):
+                    continue
+            accessible_flows.append(flow)
+        return accessible_flows
+
+    def get_flow_list_by_user_id(
+        self,
+        user_id: str,
+        permission: str = "write",
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        summary: bool = False,
+    ) -> list[dict]:
+        """
+        Same selection as get_flows_by_user_id, for list responses: plain dicts
+        of the FlowListResponse columns, newest first. Skips the owner lookup
+        and building ORM/Pydantic objects per row.
+        With summary, the nodes/edges graph is not read (FlowSummaryResponse).
+        Other users' flows without access_control are only readable, so for
+        other permissions they are filtered out in SQL. The remaining rows are
+        fetched in batches of 256 and access is checked per row, so skip/limit
+        count accessible flows and reading stops within a batch past the page.
+        """
+        columns = [Flow.id, Flow.user_id, Flow.name, Flow.description]
+        if not summary:
+            columns += [Flow.nodes, Flow.edges]
+        columns += [Flow.created_at, Flow.updated_at, Flow.meta, Flow.access_control]
+
+        skip = skip or 0
+        with get_db() as db:
+            query = select(*columns)
+            if permission != "read":
+                # A private flow's access_control is usually the JSON literal
+                # null rather than SQL NULL (rows from before the column was
+                # added are the latter), so both are excluded
+                query = query.where(
+                    or_(
+                        Flow.user_id == user_id,
+                        and_(
+                            Flow.access_control.isnot(None),
+                            cast(Flow.access_control, String) != "null",
+                        ),
+                    )
+                )
+            rows = db.execute(
+                query.order_by(Flow.updated_at.desc()).execution_options(
+                    yield_per=256
+                )
+            ).mappings()
+
+            user_group_ids = None
+            flows = []
+            for row in rows:
+                if row["user_id"] != user_id:
+                    if row["access_control"] is not None and user_group_ids is None:
+                        user_group_ids = {
+                            group.id
+                            for group in Groups.get_groups_by_member_id(user_id)
+                        }
+                    if not has_access(
+                        user_id, permission, row["access_control"], user_group_ids
+                    ):
+                        continue
+
+                if skip:
+                    skip -= 1
+                    continue
+
+                flow = dict(row)
+                del flow["user_id"]
+                # meta has a server default, but may still be NULL in old rows
+                flow["meta"] = flow["meta"] or {}
+                flows.append(flow)
+                if limit is not None and len(flows) >= limit:
+                    break
+            return flows
 
     def get_flow_by_id(self, id: str) -> Optional[FlowModel]:
+        """
+        The flow's owner and access_control are always read from the database,
+        as callers authorize on them; the cached copy only saves loading the
+        nodes/edges graph, and is used while its updated_at is current.
+        """
         with get_db() as db:
+            current = db.execute(
+                select(Flow.user_id, Flow.access_control, Flow.updated_at).where(
+                    Flow.id == id
+                )
+            ).first()
+
+            if current is None:
+                _flow_cache.pop(id)
+                return None
+
+            flow = _flow_cache.get(id)
+            if flow and flow.updated_at == current.updated_at:
+                if (
+                    flow.user_id != current.user_id
+                    or flow.access_control != current.access_control
+                ):
+                    flow = flow.model_copy(
+                        update={
+                            "user_id": current.user_id,
+                            "access_control": current.access_control,
+                        }
+                    )
+                return flow
+
             flow = db.query(Flow).filter(Flow.id == id).first()
-            return FlowModel.model_validate(flow) if flow else None
+            flow = FlowModel.model_validate(flow) if flow else None
+
+        if flow:
+            _flow_cache.set(id, flow)
+
+        return flow
 
     def get_flow_by_id_and_user_id(
         self, id: str, user_id: str
@@ -215,11 +420,34 @@ class FlowTable:
             )
             return FlowModel.model_validate(flow) if flow else None
 
+    def _flow_filter(
+        self, id: str, user_id: Optional[str] = None, is_admin: bool = False
+    ) -> tuple:
+        # Without a user, or for admins, any flow with the id matches;
+        # otherwise only a flow owned by the user does
+        if user_id is None or is_admin:
+            return (Flow.id == id,)
+        return (Flow.id == id, Flow.user_id == user_id)
+
     def update_flow_by_id(
         self, id: str, form_data: FlowUpdateForm
+    ) -> Optional[FlowModel]:
+        return self._update_flow(self._flow_filter(id), form_data)
+
+    def update_flow_by_id_for_user(
+        self, id: str, user_id: str, is_admin: bool, form_data: FlowUpdateForm
+    ) -> Optional[FlowModel]:
+        """
+        Update a flow only if it is owned by the user (or the user is an admin).
+        Returns None when no such flow exists.
+        """
+        return self._update_flow(self._flow_filter(id, user_id, is_admin), form_data)
+
+    def _update_flow(
+        self, filters: tuple, form_data: FlowUpdateForm
     ) -> Optional[FlowModel]:
         with get_db() as db:
-            flow = db.query(Flow).filter(Flow.id == id).first()
+            flow = db.query(Flow).filter(*filters).first()
             
             if not flow:
                 return None
@@ -240,39 +468,67 @@ class FlowTable:
 
             db.commit()
             db.refresh(flow)
-            return FlowModel.model_validate(flow)
+            # Write through: the editor reads the flow back right after saving
+            updated_flow = FlowModel.model_validate(flow)
+            _flow_cache.set(updated_flow.id, updated_flow)
+            return updated_flow
 
     def duplicate_flow_by_id(
         self, id: str, user_id: str, name: Optional[str] = None
     ) -> Optional[FlowModel]:
-        with get_db() as db:
-            original_flow = db.query(Flow).filter(Flow.id == id).first()
-            
-            if not original_flow:
-                return None
+        return self._duplicate_flow(self._flow_filter(id), user_id, name)
 
+    def duplicate_flow_by_id_for_user(
+        self, id: str, user_id: str, is_admin: bool, name: Optional[str] = None
+    ) -> Optional[FlowModel]:
+        """
+        Duplicate a flow only if it is owned by the user (or the user is an admin).
+        Returns None when no such flow exists.
+        """
+        return self._duplicate_flow(
+            self._flow_filter(id, user_id, is_admin), user_id, name
+        )
+
+    def _duplicate_flow(
+        self, filters: tuple, user_id: str, name: Optional[str] = None
+    ) -> Optional[FlowModel]:
+        with get_db() as db:
             new_id = str(uuid.uuid4())
-            new_name = name if name else f"{original_flow.name} (Copy)"
-            
-            new_flow = FlowModel(
-                **{
-                    "id": new_id,
-                    "user_id": user_id,
-                    "name": new_name,
-                    "description": original_flow.description,
-                    "nodes": original_flow.nodes,
-                    "edges": original_flow.edges,
-                    "created_at": int(time.time()),
-                    "updated_at": int(time.time()),
-                    "meta": original_flow.meta,
-                    "access_control": None,  # Duplicated flows start as private
-                }
+            now = int(time.time())
+
+            # Copy the row inside the database with INSERT ... SELECT, so the
+            # original nodes/edges are not read into Python and written back
+            db.execute(
+                insert(Flow).from_select(
+                    [
+                        Flow.id,
+                        Flow.user_id,
+                        Flow.name,
+                        Flow.description,
+                        Flow.nodes,
+                        Flow.edges,
+                        Flow.created_at,
+                        Flow.updated_at,
+                        Flow.meta,
+                        Flow.access_control,
+                    ],
+                    select(
+                        literal(new_id, String),
+                        literal(user_id, String),
+                        literal(name, Text) if name else Flow.name + " (Copy)",
+                        Flow.description,
+                        Flow.nodes,
+                        Flow.edges,
+                        literal(now, BigInteger),
+                        literal(now, BigInteger),
+                        Flow.meta,
+                        literal(None, JSON),  # Duplicated flows start as private
+                    ).where(*filters),
+                )
             )
-
-            result = Flow(**new_flow.model_dump())
-            db.add(result)
             db.commit()
-            db.refresh(result)
+
+            result = db.query(Flow).filter(Flow.id == new_id).first()
             return FlowModel.model_validate(result) if result else None
 
     def delete_flow_by_id(self, id: str) -> bool:
@@ -284,12 +540,31 @@ class FlowTable:
 
             db.delete(flow)
             db.commit()
+            _flow_cache.pop(id)
             return True
 
+    def delete_flow_by_id_for_user(
+        self, id: str, user_id: str, is_admin: bool
+    ) -> bool:
+        """
+        Delete a flow only if it is owned by the user (or the user is an admin),
+        in a single DELETE statement. Returns False when nothing was deleted.
+        """
+        with get_db() as db:
+            deleted = (
+                db.query(Flow)
+                .filter(*self._flow_filter(id, user_id, is_admin))
+                .delete()
+            )
+            db.commit()
+            _flow_cache.pop(id)
+            return deleted > 0
+
     def delete_flows_by_user_id(self, user_id: str) -> bool:
         with get_db() as db:
             db.query(Flow).filter(Flow.user_id == user_id).delete()
             db.commit()
+            _flow_cache.clear()
             return True
 
 
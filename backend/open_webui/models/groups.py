@@ -141,6 +141,20 @@ class GroupTable:
                 .all()
             ]
 
+    def get_member_group_ids(self, user_id: str, group_ids: list[str]) -> set[str]:
+        """Ids of the given groups that the user is a member of"""
+        if not group_ids:
+            return set()
+
+        with get_db() as db:
+            return {
+                id
+                for (id,) in db.query(Group.id)
+                .filter(Group.id.in_(group_ids))
+                .filter(Group.user_ids.cast(String).like(f'%"{user_id}"%'))
+                .all()
+            }
+
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
@@ -157,8 +157,8 @@ class KnowledgeTable:
             return False
         if knowledge.user_id == user_id:
             return True
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
-        return has_access(user_id, permission, knowledge.access_control, user_group_ids)
+        # has_access only loads the user's groups if there is an access_control
+        return has_access(user_id, permission, knowledge.access_control)
 
     def get_knowledge_bases_by_user_id(
         self, user_id: str, permission: str = "write"
@@ -223,6 +223,11 @@ class ModelsTable:
         except Exception:
             return None
 
+    def model_exists(self, id: str) -> bool:
+        """Whether a model with the id exists, without loading the row"""
+        with get_db() as db:
+            return db.query(Model.id).filter_by(id=id).first() is not None
+
     def toggle_model_by_id(self, id: str) -> Optional[ModelModel]:
         with get_db() as db:
             try:
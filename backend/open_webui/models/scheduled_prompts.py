@@ -1,14 +1,14 @@
 import logging
 import time
 import uuid
-from typing import Optional, List, Literal
+from typing import Callable, Iterator, Optional, List, Literal
 
 from open_webui.internal.db import Base, get_db, JSONField
 from open_webui.env import SRC_LOG_LEVELS
-from open_webui.models.users import Users, UserResponse
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Integer, Index
+from sqlalchemy import func, insert, literal, select
 
 ####################
 # ScheduledPrompt DB Schema
@@ -17,6 +17,13 @@ from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Integer,
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+# Prompts are read by id first thing in most endpoints, and polled for their
+# run status; keep a short-lived per-process copy. Writes here drop it, the
+# short TTL bounds staleness for runs recorded by other workers
+SCHEDULED_PROMPT_CACHE_TTL = 5
+SCHEDULED_PROMPT_CACHE_MAX_SIZE = 256
+_scheduled_prompt_cache: dict[str, tuple[float, "ScheduledPromptModel"]] = {}
+
 
 class ScheduledPrompt(Base):
     __tablename__ = "scheduled_prompt"
@@ -155,9 +162,25 @@ class ScheduledPromptResponse(BaseModel):
     updated_at: int
 
 
-class ScheduledPromptUserResponse(ScheduledPromptModel):
-    """ScheduledPrompt model with user information for list responses"""
-    user: Optional[UserResponse] = None
+class ScheduledPromptSummaryResponse(BaseModel):
+    """ScheduledPromptResponse without the prompt texts, for lightweight listings"""
+
+    id: str
+    user_id: str
+    name: str
+    cron_expression: str
+    timezone: str
+    enabled: bool
+    model_id: str
+    chat_id: Optional[str] = None
+    create_new_chat: bool = True
+    run_once: bool = False
+    last_run_at: Optional[int] = None
+    next_run_at: Optional[int] = None
+    last_status: Optional[str] = None
+    run_count: int
+    created_at: int
+    updated_at: int
 
 
 ####################
@@ -166,32 +189,35 @@ class ScheduledPromptUserResponse(ScheduledPromptModel):
 
 
 class ScheduledPromptTable:
+    def _new_scheduled_prompt(
+        self, user_id: str, form_data: ScheduledPromptForm, next_run_at: Optional[int] = None
+    ) -> ScheduledPromptModel:
+        return ScheduledPromptModel(
+            **{
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "name": form_data.name,
+                "cron_expression": form_data.cron_expression,
+                "timezone": form_data.timezone,
+                "enabled": form_data.enabled,
+                "model_id": form_data.model_id,
+                "system_prompt": form_data.system_prompt,
+                "prompt": form_data.prompt,
+                "create_new_chat": form_data.create_new_chat,
+                "run_once": form_data.run_once,
+                "tool_ids": form_data.tool_ids,
+                "function_calling_mode": form_data.function_calling_mode,
+                "next_run_at": next_run_at,
+                "created_at": int(time.time()),
+                "updated_at": int(time.time()),
+            }
+        )
+
     def insert_new_scheduled_prompt(
         self, user_id: str, form_data: ScheduledPromptForm, next_run_at: Optional[int] = None
     ) -> Optional[ScheduledPromptModel]:
         with get_db() as db:
-            id = str(uuid.uuid4())
-            
-            scheduled_prompt = ScheduledPromptModel(
-                **{
-                    "id": id,
-                    "user_id": user_id,
-                    "name": form_data.name,
-                    "cron_expression": form_data.cron_expression,
-                    "timezone": form_data.timezone,
-                    "enabled": form_data.enabled,
-                    "model_id": form_data.model_id,
-                    "system_prompt": form_data.system_prompt,
-                    "prompt": form_data.prompt,
-                    "create_new_chat": form_data.create_new_chat,
-                    "run_once": form_data.run_once,
-                    "tool_ids": form_data.tool_ids,
-                    "function_calling_mode": form_data.function_calling_mode,
-                    "next_run_at": next_run_at,
-                    "created_at": int(time.time()),
-                    "updated_at": int(time.time()),
-                }
-            )
+            scheduled_prompt = self._new_scheduled_prompt(user_id, form_data, next_run_at)
 
             result = ScheduledPrompt(**scheduled_prompt.model_dump())
             db.add(result)
@@ -199,27 +225,54 @@ class ScheduledPromptTable:
             db.refresh(result)
             return ScheduledPromptModel.model_validate(result) if result else None
 
-    def get_scheduled_prompts(self) -> list[ScheduledPromptUserResponse]:
-        """Get all scheduled prompts with user information"""
+    def insert_new_scheduled_prompt_within_limit(
+        self,
+        user_id: str,
+        form_data: ScheduledPromptForm,
+        limit: int,
+        next_run_at: Optional[int] = None,
+    ) -> Optional[ScheduledPromptModel]:
+        """
+        Insert a prompt unless the user already has `limit` of them.
+        Returns None when the limit is reached.
+        """
         with get_db() as db:
-            all_prompts = db.query(ScheduledPrompt).order_by(ScheduledPrompt.updated_at.desc()).all()
-
-            user_ids = list(set(prompt.user_id for prompt in all_prompts))
-            users = Users.get_users_by_user_ids(user_ids) if user_ids else []
-            users_dict = {user.id: user for user in users}
-
-            prompts = []
-            for prompt in all_prompts:
-                user = users_dict.get(prompt.user_id)
-                prompts.append(
-                    ScheduledPromptUserResponse.model_validate(
-                        {
-                            **ScheduledPromptModel.model_validate(prompt).model_dump(),
-                            "user": user.model_dump() if user else None,
-                        }
-                    )
+            scheduled_prompt = self._new_scheduled_prompt(user_id, form_data, next_run_at)
+            row = scheduled_prompt.model_dump()
+            columns = ScheduledPrompt.__table__.columns
+
+            # The count is a subquery of the INSERT ... SELECT itself, so the
+            # limit check and the insert are a single statement
+            user_prompt_count = (
+                select(func.count(ScheduledPrompt.id))
+                .where(ScheduledPrompt.user_id == user_id)
+                .scalar_subquery()
+            )
+            result = db.execute(
+                insert(ScheduledPrompt).from_select(
+                    list(row),
+                    select(
+                        *[literal(value, columns[key].type) for key, value in row.items()]
+                    ).where(user_prompt_count < limit),
                 )
-            return prompts
+            )
+            db.commit()
+
+            if not result.rowcount:
+                return None
+
+            prompt = db.query(ScheduledPrompt).filter_by(id=scheduled_prompt.id).first()
+            return ScheduledPromptModel.model_validate(prompt) if prompt else None
+
+    def iter_scheduled_prompts(self) -> Iterator[ScheduledPromptModel]:
+        """
+        Stream all scheduled prompts, newest first, without materializing
+        every row at once. Owners are not attached.
+        """
+        with get_db() as db:
+            query = db.query(ScheduledPrompt).order_by(ScheduledPrompt.updated_at.desc())
+            for prompt in query.execution_options(stream_results=True).yield_per(256):
+                yield ScheduledPromptModel.model_validate(prompt)
 
     def get_scheduled_prompts_by_user_id(self, user_id: str) -> list[ScheduledPromptModel]:
         """Get all scheduled prompts for a specific user"""
@@ -232,6 +285,41 @@ class ScheduledPromptTable:
             )
             return [ScheduledPromptModel.model_validate(p) for p in prompts]
 
+    def get_scheduled_prompt_summaries(
+        self, user_id: Optional[str] = None
+    ) -> list[dict]:
+        """
+        ScheduledPromptSummaryResponse columns of all prompts, or of one user's,
+        as plain dicts, newest first. The prompt texts and last error are not
+        read at all.
+        """
+        query = select(
+            *(
+                getattr(ScheduledPrompt, field)
+                for field in ScheduledPromptSummaryResponse.model_fields
+            )
+        ).order_by(ScheduledPrompt.updated_at.desc())
+        if user_id is not None:
+            query = query.where(ScheduledPrompt.user_id == user_id)
+
+        with get_db() as db:
+            return [dict(row) for row in db.execute(query).mappings()]
+
+    def get_scheduled_prompt_list_version(
+        self, user_id: Optional[str] = None
+    ) -> tuple[int, Optional[int]]:
+        """
+        (count, latest updated_at) of all prompts, or of one user's. Every
+        insert, update and delete changes it, so it versions the list.
+        """
+        query = select(func.count(ScheduledPrompt.id), func.max(ScheduledPrompt.updated_at))
+        if user_id is not None:
+            query = query.where(ScheduledPrompt.user_id == user_id)
+
+        with get_db() as db:
+            count, latest_updated_at = db.execute(query).one()
+            return count, latest_updated_at
+
     def get_enabled_scheduled_prompts(self) -> list[ScheduledPromptModel]:
         """Get all enabled scheduled prompts (for scheduler)"""
         with get_db() as db:
@@ -259,9 +347,26 @@ class ScheduledPromptTable:
             return [ScheduledPromptModel.model_validate(p) for p in prompts]
 
     def get_scheduled_prompt_by_id(self, id: str) -> Optional[ScheduledPromptModel]:
+        now = time.monotonic()
+
+        cached = _scheduled_prompt_cache.get(id)
+        if cached and now - cached[0] < SCHEDULED_PROMPT_CACHE_TTL:
+            return cached[1]
+
         with get_db() as db:
             prompt = db.query(ScheduledPrompt).filter(ScheduledPrompt.id == id).first()
-            return ScheduledPromptModel.model_validate(prompt) if prompt else None
+            if not prompt:
+                return None
+
+            scheduled_prompt = ScheduledPromptModel.model_validate(prompt)
+
+        _scheduled_prompt_cache.pop(id, None)
+        if len(_scheduled_prompt_cache) >= SCHEDULED_PROMPT_CACHE_MAX_SIZE:
+            # Evict the oldest entry
+            _scheduled_prompt_cache.pop(next(iter(_scheduled_prompt_cache)))
+        _scheduled_prompt_cache[id] = (now, scheduled_prompt)
+
+        return scheduled_prompt
 
     def get_scheduled_prompt_by_id_and_user_id(
         self, id: str, user_id: str
@@ -274,11 +379,51 @@ class ScheduledPromptTable:
             )
             return ScheduledPromptModel.model_validate(prompt) if prompt else None
 
+    def _scheduled_prompt_filter(
+        self, id: str, user_id: Optional[str] = None, is_admin: bool = False
+    ) -> tuple:
+        # Without a user, or for admins, any prompt with the id matches;
+        # otherwise only a prompt owned by the user does
+        if user_id is None or is_admin:
+            return (ScheduledPrompt.id == id,)
+        return (ScheduledPrompt.id == id, ScheduledPrompt.user_id == user_id)
+
     def update_scheduled_prompt_by_id(
         self, id: str, form_data: ScheduledPromptUpdateForm, next_run_at: Optional[int] = None
+    ) -> Optional[ScheduledPromptModel]:
+        return self._update_scheduled_prompt(
+            self._scheduled_prompt_filter(id), form_data, next_run_at
+        )
+
+    def update_scheduled_prompt_by_id_for_user(
+        self,
+        id: str,
+        user_id: str,
+        is_admin: bool,
+        form_data: ScheduledPromptUpdateForm,
+        calculate_next_run: Callable[[str, str], int],
+    ) -> Optional[ScheduledPromptModel]:
+        """
+        Update a prompt only if it is owned by the user (or the user is an admin),
+        reading and writing it in one session. If the schedule changes, the next
+        run is recalculated from the updated cron expression and timezone.
+        Returns None when no such prompt exists.
+        """
+        return self._update_scheduled_prompt(
+            self._scheduled_prompt_filter(id, user_id, is_admin),
+            form_data,
+            calculate_next_run=calculate_next_run,
+        )
+
+    def _update_scheduled_prompt(
+        self,
+        filters: tuple,
+        form_data: ScheduledPromptUpdateForm,
+        next_run_at: Optional[int] = None,
+        calculate_next_run: Optional[Callable[[str, str], int]] = None,
     ) -> Optional[ScheduledPromptModel]:
         with get_db() as db:
-            prompt = db.query(ScheduledPrompt).filter(ScheduledPrompt.id == id).first()
+            prompt = db.query(ScheduledPrompt).filter(*filters).first()
             
             if not prompt:
                 return None
@@ -306,6 +451,15 @@ class ScheduledPromptTable:
                 prompt.tool_ids = form_data.tool_ids
             if form_data.function_calling_mode is not None:
                 prompt.function_calling_mode = form_data.function_calling_mode
+            if (
+                next_run_at is None
+                and calculate_next_run is not None
+                and (
+                    form_data.cron_expression is not None
+                    or form_data.timezone is not None
+                )
+            ):
+                next_run_at = calculate_next_run(prompt.cron_expression, prompt.timezone)
             if next_run_at is not None:
                 prompt.next_run_at = next_run_at
                 
@@ -313,6 +467,42 @@ class ScheduledPromptTable:
 
             db.commit()
             db.refresh(prompt)
+            _scheduled_prompt_cache.pop(prompt.id, None)
+            return ScheduledPromptModel.model_validate(prompt)
+
+    def toggle_scheduled_prompt_by_id_for_user(
+        self,
+        id: str,
+        user_id: str,
+        is_admin: bool,
+        calculate_next_run: Callable[[str, str], int],
+    ) -> Optional[ScheduledPromptModel]:
+        """
+        Flip enabled on a prompt owned by the user (or any prompt for admins) in
+        one session. Enabling recalculates the next run. Returns None when no
+        such prompt exists.
+        """
+        with get_db() as db:
+            prompt = (
+                db.query(ScheduledPrompt)
+                .filter(*self._scheduled_prompt_filter(id, user_id, is_admin))
+                .first()
+            )
+
+            if not prompt:
+                return None
+
+            prompt.enabled = not prompt.enabled
+            if prompt.enabled:
+                prompt.next_run_at = calculate_next_run(
+                    prompt.cron_expression, prompt.timezone
+                )
+
+            prompt.updated_at = int(time.time())
+
+            db.commit()
+            db.refresh(prompt)
+            _scheduled_prompt_cache.pop(prompt.id, None)
             return ScheduledPromptModel.model_validate(prompt)
 
     def update_execution_status(
@@ -344,6 +534,7 @@ class ScheduledPromptTable:
 
             db.commit()
             db.refresh(prompt)
+            _scheduled_prompt_cache.pop(prompt.id, None)
             return ScheduledPromptModel.model_validate(prompt)
 
     def set_next_run_at(self, id: str, next_run_at: int) -> Optional[ScheduledPromptModel]:
@@ -359,6 +550,7 @@ class ScheduledPromptTable:
 
             db.commit()
             db.refresh(prompt)
+            _scheduled_prompt_cache.pop(prompt.id, None)
             return ScheduledPromptModel.model_validate(prompt)
 
     def delete_scheduled_prompt_by_id(self, id: str) -> bool:
@@ -370,12 +562,14 @@ class ScheduledPromptTable:
 
             db.delete(prompt)
             db.commit()
+            _scheduled_prompt_cache.pop(id, None)
             return True
 
     def delete_scheduled_prompts_by_user_id(self, user_id: str) -> bool:
         with get_db() as db:
             db.query(ScheduledPrompt).filter(ScheduledPrompt.user_id == user_id).delete()
             db.commit()
+            _scheduled_prompt_cache.clear()
             return True
 
     def count_scheduled_prompts_by_user_id(self, user_id: str) -> int:
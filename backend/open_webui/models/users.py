@@ -81,6 +81,10 @@ class UserModel(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
 
 ####################
 # Forms
@@ -3,8 +3,12 @@ Admin Dashboard API Router
 Provides statistics and analytics for the admin dashboard page.
 """
 
+import asyncio
+import heapq
 import logging
 import time
+from collections import Counter, defaultdict
+from operator import itemgetter
 from typing import Optional
 
 import aiohttp
@@ -20,15 +24,17 @@ from open_webui.models.models import Models
 from open_webui.models.groups import Groups
 from open_webui.models.knowledge import Knowledges
 
-from open_webui.socket.main import get_active_user_ids
+from open_webui.socket.main import get_active_user_count
 from open_webui.utils.auth import get_admin_user
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND, SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 router = APIRouter()
 
+LITELLM_SPEND_TIMEOUT = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_LITELLM_SPEND)
+
 
 class DashboardStatsResponse(BaseModel):
     users: dict
@@ -57,10 +63,69 @@ def calc_comparison(current: float, previous: float) -> dict:
     }
 
 
+# In-flight LiteLLM spend lookups keyed by (base_url, user_id), so concurrent
+# dashboard requests piggy-back on a single upstream call per user
+_LITELLM_SPEND_INFLIGHT: dict[tuple[str, str], asyncio.Future] = {}
+
+
+async def _fetch_litellm_user_spend(
+    session: aiohttp.ClientSession, base_url: str, headers: dict, user_id: str
+) -> Optional[dict]:
+    """
+    Fetch spend data for a single user from LiteLLM.
+    Returns {spend: float, max_budget: ...} or None if unavailable.
+    """
+    try:
+        # Try /customer/info first (for end_user_id tracking)
+        async with session.get(
+            f"{base_url}/customer/info",
+            params={"end_user_id": user_id},
+            headers=headers,
+            timeout=LITELLM_SPEND_TIMEOUT
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                spend = data.get("spend", 0.0)
+                log.debug(f"[DASHBOARD] /customer/info for {user_id[:8]}...: spend={spend}")
+                return {
+                    "spend": spend,
+                    "max_budget": data.get("max_budget"),
+                }
+            elif response.status == 500:
+                # 500 might mean user not found in customer tracking, try /user/info
+                log.debug(f"[DASHBOARD] /customer/info returned 500 for {user_id}, trying /user/info")
+            else:
+                log.debug(f"[DASHBOARD] /customer/info returned {response.status} for {user_id}")
+        
+        # Fallback: Try /user/info (for user_id on keys)
+        async with session.get(
+            f"{base_url}/user/info",
+            params={"user_id": user_id},
+            headers=headers,
+            timeout=LITELLM_SPEND_TIMEOUT
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                user_info = data.get("user_info", {})
+                spend = user_info.get("spend", 0.0) if isinstance(user_info, dict) else 0.0
+                log.debug(f"[DASHBOARD] /user/info for {user_id[:8]}...: spend={spend}")
+                return {
+                    "spend": spend,
+                    "max_budget": user_info.get("max_budget") if isinstance(user_info, dict) else None,
+                }
+            else:
+                log.debug(f"[DASHBOARD] Both LiteLLM endpoints failed for {user_id}")
+    except Exception as e:
+        log.warning(f"[DASHBOARD] Failed to fetch LiteLLM spend for {user_id}: {e}")
+    
+    return None
+
+
 async def fetch_litellm_spend(base_url: str, master_key: str, user_ids: list) -> dict:
     """
     Fetch spend data from LiteLLM for given user IDs.
     Tries /customer/info first (end_user_id tracking), then falls back to /user/info.
+    Concurrent callers asking for the same user await the in-flight lookup.
     Returns dict mapping user_id -> {spend: float, ...}
     """
     cost_data = {}
@@ -76,53 +141,29 @@ async def fetch_litellm_spend(base_url: str, master_key: str, user_ids: list) ->
     log.info(f"[DASHBOARD] Fetching spend for {len(user_ids)} users from {base_url}")
     
     headers = {"Authorization": f"Bearer {master_key}"}
+    loop = asyncio.get_running_loop()
     
     async with aiohttp.ClientSession() as session:
         for user_id in user_ids:
-            try:
-                # Try /customer/info first (for end_user_id tracking)
-                async with session.get(
-                    f"{base_url}/customer/info",
-                    params={"end_user_id": user_id},
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        spend = data.get("spend", 0.0)
-                        log.debug(f"[DASHBOARD] /customer/info for {user_id[:8]}...: spend={spend}")
-                        cost_data[user_id] = {
-                            "spend": spend,
-                            "max_budget": data.get("max_budget"),
-                        }
-                        continue
-                    elif response.status == 500:
-                        # 500 might mean user not found in customer tracking, try /user/info
-                        log.debug(f"[DASHBOARD] /customer/info returned 500 for {user_id}, trying /user/info")
-                    else:
-                        log.debug(f"[DASHBOARD] /customer/info returned {response.status} for {user_id}")
-                
-                # Fallback: Try /user/info (for user_id on keys)
-                async with session.get(
-                    f"{base_url}/user/info",
-                    params={"user_id": user_id},
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        user_info = data.get("user_info", {})
-                        spend = user_info.get("spend", 0.0) if isinstance(user_info, dict) else 0.0
-                        log.debug(f"[DASHBOARD] /user/info for {user_id[:8]}...: spend={spend}")
-                        cost_data[user_id] = {
-                            "spend": spend,
-                            "max_budget": user_info.get("max_budget") if isinstance(user_info, dict) else None,
-                        }
-                    else:
-                        log.debug(f"[DASHBOARD] Both LiteLLM endpoints failed for {user_id}")
-            except Exception as e:
-                log.warning(f"[DASHBOARD] Failed to fetch LiteLLM spend for {user_id}: {e}")
-                continue
+            key = (base_url, user_id)
+            future = _LITELLM_SPEND_INFLIGHT.get(key)
+            if future is not None:
+                cost_info = await asyncio.shield(future)
+            else:
+                future = loop.create_future()
+                _LITELLM_SPEND_INFLIGHT[key] = future
+                cost_info = None
+                try:
+                    cost_info = await _fetch_litellm_user_spend(
+                        session, base_url, headers, user_id
+                    )
+                finally:
+                    _LITELLM_SPEND_INFLIGHT.pop(key, None)
+                    if not future.done():
+                        future.set_result(cost_info)
+            
+            if cost_info is not None:
+                cost_data[user_id] = cost_info
     
     log.info(f"[DASHBOARD] Retrieved spend data for {len(cost_data)} users")
     
@@ -182,8 +223,7 @@ async def get_dashboard_stats(
     # Active now
     active_now_count = 0
     try:
-        active_user_ids = get_active_user_ids()
-        active_now_count = len(active_user_ids)
+        active_now_count = get_active_user_count()
     except:
         pass
     
@@ -202,7 +242,8 @@ async def get_dashboard_stats(
     active_previous_month = sum(1 for u in all_users if two_months_ago <= u.last_active_at < month_ago)
     
     # ===== CHAT STATS =====
-    all_chats = Chats.get_chats()
+    # Scalar columns only; the chat JSON is streamed separately for token stats
+    all_chats = Chats.get_chats_meta()
     total_chats = len(all_chats)
     
     # Build user_id → chats map
@@ -227,33 +268,44 @@ async def get_dashboard_stats(
     chat_activity_previous_month = sum(1 for c in all_chats if two_months_ago <= c.updated_at < month_ago)
     
     # ===== MODEL & TOKEN STATS =====
-    model_usage = {}
+    model_usage = Counter()
     model_prompt_tokens = {}
     model_completion_tokens = {}
+    # Per-chat token sums, reused for the per-user totals below
+    chat_prompt = defaultdict(int)
+    chat_completion = defaultdict(int)
     total_prompt_tokens = 0
     total_completion_tokens = 0
     
-    for chat in all_chats:
-        chat_data = chat.chat if hasattr(chat, 'chat') else {}
-        if isinstance(chat_data, dict):
-            messages = chat_data.get("messages", [])
-            for msg in messages:
-                if isinstance(msg, dict):
-                    model_id = msg.get("model") or msg.get("modelId")
-                    if model_id:
-                        model_usage[model_id] = model_usage.get(model_id, 0) + 1
-                    
-                    if "usage" in msg and isinstance(msg["usage"], dict):
-                        usage = msg["usage"]
-                        prompt_tokens = usage.get("prompt_tokens", 0)
-                        completion_tokens = usage.get("completion_tokens", 0)
-                        
-                        total_prompt_tokens += prompt_tokens
-                        total_completion_tokens += completion_tokens
-                        
-                        if model_id:
-                            model_prompt_tokens[model_id] = model_prompt_tokens.get(model_id, 0) + prompt_tokens
-                            model_completion_tokens[model_id] = model_completion_tokens.get(model_id, 0) + completion_tokens
+    for chat in Chats.iter_chat_json():
+        # The chat column is always a dict; malformed messages (non-dicts) are
+        # skipped via AttributeError instead of per-item checks
+        for msg in (chat.chat or {}).get("messages", ()):
+            try:
+                model_id = msg.get("model") or msg.get("modelId")
+                usage = msg.get("usage")
+            except AttributeError:
+                continue
+            
+            if model_id:
+                model_usage[model_id] += 1
+            
+            if usage:
+                # A malformed (non-dict) usage only drops this message's tokens
+                try:
+                    prompt_tokens = usage.get("prompt_tokens", 0)
+                    completion_tokens = usage.get("completion_tokens", 0)
+                except AttributeError:
+                    continue
+                
+                total_prompt_tokens += prompt_tokens
+                total_completion_tokens += completion_tokens
+                chat_prompt[chat.id] += prompt_tokens
+                chat_completion[chat.id] += completion_tokens
+                
+                if model_id:
+                    model_prompt_tokens[model_id] = model_prompt_tokens.get(model_id, 0) + prompt_tokens
+                    model_completion_tokens[model_id] = model_completion_tokens.get(model_id, 0) + completion_tokens
     
     total_tokens = total_prompt_tokens + total_completion_tokens
     
@@ -279,16 +331,16 @@ async def get_dashboard_stats(
     except Exception as e:
         log.warning(f"[DASHBOARD] Failed to fetch workspace models: {e}")
     
-    # Build enhanced model lists
-    all_models_enhanced = []
-    for model_id, count in sorted(model_usage.items(), key=lambda x: x[1], reverse=True):
+    # Build enhanced model entries for the top 10 only
+    top_models = []
+    for model_id, count in model_usage.most_common(10):
         model_meta = model_metadata.get(model_id)
         display_name = model_meta.name if model_meta else model_id
         is_hidden = getattr(model_meta.meta, 'hidden', False) if (model_meta and model_meta.meta) else False
         is_workspace = model_id in model_metadata
         is_modelfile = model_meta.base_model_id is not None if model_meta else False
         
-        all_models_enhanced.append({
+        top_models.append({
             'id': model_id,
             'name': display_name,
             'messages': count,
@@ -300,25 +352,21 @@ async def get_dashboard_stats(
             'is_hidden': is_hidden,
         })
     
-    top_models = all_models_enhanced[:10]
-    
     # ===== USER ACTIVITY WITH TOKENS =====
+    litellm_enabled = request.app.state.config.ENABLE_LITELLM_SPEND
+    
     user_chat_data = []
     for user in all_users:
+        # Users without chats stay in the list (with zero counts) whether or
+        # not spend is enabled, so its shape doesn't depend on the flag
         chats = user_chats_lookup.get(user.id, [])
+        
         user_prompt_tokens = 0
         user_completion_tokens = 0
         
         for chat in chats:
-            chat_data = chat.chat if hasattr(chat, 'chat') else {}
-            if isinstance(chat_data, dict):
-                messages = chat_data.get("messages", [])
-                for msg in messages:
-                    if isinstance(msg, dict) and "usage" in msg:
-                        usage = msg.get("usage", {})
-                        if isinstance(usage, dict):
-                            user_prompt_tokens += usage.get("prompt_tokens", 0)
-                            user_completion_tokens += usage.get("completion_tokens", 0)
+            user_prompt_tokens += chat_prompt.get(chat.id, 0)
+            user_completion_tokens += chat_completion.get(chat.id, 0)
         
         user_chat_data.append({
             'name': user.name,
@@ -331,14 +379,13 @@ async def get_dashboard_stats(
             'last_active_at': user.last_active_at
         })
     
-    user_chat_data.sort(key=lambda x: x['chats'], reverse=True)
-    top_users_by_chats = user_chat_data[:10]
+    top_users_by_chats = heapq.nlargest(10, user_chat_data, key=itemgetter('chats'))
     
-    top_users_by_tokens = sorted(
-        [u for u in user_chat_data if u['total_tokens'] > 0],
-        key=lambda x: x['total_tokens'],
-        reverse=True
-    )[:10]
+    top_users_by_tokens = heapq.nlargest(
+        10,
+        (u for u in user_chat_data if u['total_tokens'] > 0),
+        key=itemgetter('total_tokens'),
+    )
     
     # ===== FILE STATS =====
     all_files = Files.get_files()
@@ -352,19 +399,21 @@ async def get_dashboard_stats(
     for f in all_files:
         content_type = f.meta.get("content_type", "unknown") if f.meta else "unknown"
         file_types[content_type] = file_types.get(content_type, 0) + 1
-    top_file_types = sorted(file_types.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_file_types = heapq.nlargest(5, file_types.items(), key=itemgetter(1))
     
     # ===== GROUP STATS =====
     all_groups = Groups.get_groups()
     total_groups = len(all_groups)
     total_group_members = sum(len(g.user_ids) if g.user_ids else 0 for g in all_groups)
     
-    groups_with_members = [
-        {"name": g.name, "members": len(g.user_ids) if g.user_ids else 0}
-        for g in all_groups
-    ]
-    groups_with_members.sort(key=lambda x: x['members'], reverse=True)
-    top_groups = groups_with_members[:10]
+    top_groups = heapq.nlargest(
+        10,
+        (
+            {"name": g.name, "members": len(g.user_ids) if g.user_ids else 0}
+            for g in all_groups
+        ),
+        key=itemgetter('members'),
+    )
     
     # ===== FEEDBACK STATS =====
     all_feedbacks = Feedbacks.get_all_feedbacks()
@@ -404,7 +453,6 @@ async def get_dashboard_stats(
     total_platform_spend = 0.0
     users_with_spend = 0
     top_users_by_spend = []
-    litellm_enabled = request.app.state.config.ENABLE_LITELLM_SPEND
     
     log.info(f"[DASHBOARD] LiteLLM enabled: {litellm_enabled}")
     
@@ -436,11 +484,9 @@ async def get_dashboard_stats(
                         'chats': u['chats'],
                     })
             
-            top_users_by_spend = sorted(
-                users_with_spend_data,
-                key=lambda x: x['spend'],
-                reverse=True
-            )[:10]
+            top_users_by_spend = heapq.nlargest(
+                10, users_with_spend_data, key=itemgetter('spend')
+            )
     
     # ===== BUILD RESPONSE =====
     return {
@@ -536,7 +582,7 @@ async def get_dashboard_stats(
             "week": knowledge_this_week,
         },
         "spend": {
-            "enabled": request.app.state.config.ENABLE_LITELLM_SPEND,
+            "enabled": litellm_enabled,
             "total": round(total_platform_spend, 2),
             "users_with_spend": users_with_spend,
             "top_users": top_users_by_spend,
@@ -749,11 +795,10 @@ async def get_dashboard_user_detail(
     chats_quarter = sum(1 for c in user_chats if c.created_at >= quarter_ago)
     
     # Top models
-    top_models = sorted(
-        [{"name": k, "messages": v} for k, v in models_used.items()],
-        key=lambda x: x["messages"],
-        reverse=True
-    )[:10]
+    top_models = [
+        {"name": k, "messages": v}
+        for k, v in heapq.nlargest(10, models_used.items(), key=itemgetter(1))
+    ]
     
     # Get user's files
     user_files = Files.get_files_by_user_id(user_id)
@@ -967,11 +1012,10 @@ async def get_dashboard_group_detail(
                     models_used[model] = models_used.get(model, 0) + 1
     
     # Top models
-    top_models = sorted(
-        [{"name": k, "messages": v} for k, v in models_used.items()],
-        key=lambda x: x["messages"],
-        reverse=True
-    )[:10]
+    top_models = [
+        {"name": k, "messages": v}
+        for k, v in heapq.nlargest(10, models_used.items(), key=itemgetter(1))
+    ]
     
     # Member stats
     member_stats = []
@@ -1240,19 +1284,17 @@ async def get_dashboard_model_detail(
     user_names = {u.id: u.name for u in all_users}
     
     # Top users
-    top_users = sorted(
-        [
-            {
-                "id": uid,
-                "name": user_names.get(uid, uid),
-                "messages": stats["messages"],
-                "tokens": stats["tokens"],
-            }
-            for uid, stats in users_using.items()
-        ],
-        key=lambda x: x["messages"],
-        reverse=True
-    )[:10]
+    top_users = [
+        {
+            "id": uid,
+            "name": user_names.get(uid, uid),
+            "messages": stats["messages"],
+            "tokens": stats["tokens"],
+        }
+        for uid, stats in heapq.nlargest(
+            10, users_using.items(), key=lambda x: x[1]["messages"]
+        )
+    ]
     
     # Add user names to recent chats
     for chat in recent_chats:
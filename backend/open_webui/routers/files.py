@@ -1,13 +1,16 @@
 import logging
 import os
 import uuid
-import json
+import stat
+import time
 from fnmatch import fnmatch
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
 import asyncio
 
+import orjson
 from fastapi import (
     BackgroundTasks,
     APIRouter,
@@ -21,7 +24,7 @@ from fastapi import (
     Query,
 )
 
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
@@ -35,20 +38,77 @@ from open_webui.models.files import (
 )
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.chats import Chats
-from open_webui.models.folders import Folders
+from open_webui.models.folders import FolderModel, Folders
 
 from open_webui.routers.knowledge import get_knowledge, get_knowledge_list
 from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
-from pydantic import BaseModel
+from open_webui.utils.file_status import subscribe_file_status
+from pydantic import BaseModel, TypeAdapter
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 router = APIRouter()
 
+# Built once; dumping a whole list through an adapter avoids per-item dispatch
+FILE_LIST_ADAPTER = TypeAdapter(list[FileModel])
+FOLDER_LIST_ADAPTER = TypeAdapter(list[FolderModel])
+
+
+class ContentFileResponse(FileResponse):
+    # Starlette reads the file through a worker thread per chunk; larger chunks
+    # mean far fewer thread hops and sends per download. Servers implementing
+    # the ASGI pathsend extension already get a zero-copy path from Starlette.
+    chunk_size = 1024 * 1024
+
+
+def get_regular_file_stat(file_path: Path) -> Optional[os.stat_result]:
+    """Stat once: replaces is_file() and is handed to the response as-is."""
+    try:
+        stat_result = file_path.stat()
+    except OSError:
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+
+
+# Storage.get_file() downloads cloud-backed files into the upload dir on every
+# call; remember the local copy for a short while so repeated reads skip that
+STORAGE_FILE_CACHE_TTL = 30
+STORAGE_FILE_CACHE_MAX_SIZE = 4096
+_storage_file_cache: dict[str, tuple[float, Path]] = {}
+
+
+async def get_local_storage_file(
+    storage_path: str,
+) -> tuple[Path, Optional[os.stat_result]]:
+    """
+    Resolve a stored file to a local path, returning it with its stat result
+    (None if it is not a regular file).
+    """
+    now = time.monotonic()
+
+    cached = _storage_file_cache.get(storage_path)
+    if cached and now - cached[0] < STORAGE_FILE_CACHE_TTL:
+        # The local copy may have been removed since, so it is still stat'ed
+        stat_result = get_regular_file_stat(cached[1])
+        if stat_result:
+            return cached[1], stat_result
+
+    file_path = Path(await asyncio.to_thread(Storage.get_file, storage_path))
+    stat_result = get_regular_file_stat(file_path)
+
+    _storage_file_cache.pop(storage_path, None)
+    if stat_result:
+        if len(_storage_file_cache) >= STORAGE_FILE_CACHE_MAX_SIZE:
+            # Evict the oldest entry
+            _storage_file_cache.pop(next(iter(_storage_file_cache)))
+        _storage_file_cache[storage_path] = (now, file_path)
+
+    return file_path, stat_result
+
 
 ############################
 # Check if the current user has access to a file through any knowledge bases the user may be in.
@@ -56,9 +116,14 @@ router = APIRouter()
 
 
 def has_access_to_file(
-    file_id: Optional[str], access_type: str, user=Depends(get_verified_user)
+    file_id: Optional[str],
+    access_type: str,
+    user=Depends(get_verified_user),
+    file: Optional[FileModel] = None,
 ) -> bool:
-    file = Files.get_file_by_id(file_id)
+    # Callers that already loaded the file pass it in to skip a second lookup
+    if file is None:
+        file = Files.get_file_by_id(file_id)
     log.debug(f"Checking if user has {access_type} access to file")
 
     if not file:
@@ -67,19 +132,16 @@ def has_access_to_file(
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    has_access = False
     knowledge_base_id = file.meta.get("collection_name") if file.meta else None
 
+    # Check the file's knowledge base directly instead of scanning every
+    # knowledge base the user can access
     if knowledge_base_id:
-        knowledge_bases = Knowledges.get_knowledge_bases_by_user_id(
-            user.id, access_type
+        return Knowledges.check_access_by_user_id(
+            knowledge_base_id, user.id, access_type
         )
-        for knowledge_base in knowledge_bases:
-            if knowledge_base.id == knowledge_base_id:
-                has_access = True
-                break
 
-    return has_access
+    return False
 
 
 ############################
@@ -87,22 +149,42 @@ def has_access_to_file(
 ############################
 
 
+def get_stt_supported_content_types(config) -> tuple[str, ...]:
+    stt_supported_content_types = getattr(config, "STT_SUPPORTED_CONTENT_TYPES", [])
+
+    if stt_supported_content_types and any(
+        t.strip() for t in stt_supported_content_types
+    ):
+        return tuple(stt_supported_content_types)
+    return ("audio/*", "video/webm")
+
+
+@lru_cache(maxsize=256)
+def is_stt_supported_content_type(content_type: str, patterns: tuple[str, ...]) -> bool:
+    # Keyed on the pattern tuple as well, so config changes are picked up
+    return any(fnmatch(content_type, pattern) for pattern in patterns)
+
+
+def is_unprocessed_media_content_type(request: Request, content_type: str) -> bool:
+    # Image and video files (other than STT-supported ones) are stored but not
+    # processed for RAG, unless an external engine handles content extraction
+    return (
+        bool(content_type)
+        and content_type.startswith(("image/", "video/"))
+        and request.app.state.config.CONTENT_EXTRACTION_ENGINE != "external"
+        and not is_stt_supported_content_type(
+            content_type, get_stt_supported_content_types(request.app.state.config)
+        )
+    )
+
+
 def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
     try:
         processed = False
         if file.content_type:
-            stt_supported_content_types = getattr(
-                request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-            )
-
-            if any(
-                fnmatch(file.content_type, content_type)
-                for content_type in (
-                    stt_supported_content_types
-                    if stt_supported_content_types
-                    and any(t.strip() for t in stt_supported_content_types)
-                    else ["audio/*", "video/webm"]
-                )
+            if is_stt_supported_content_type(
+                file.content_type,
+                get_stt_supported_content_types(request.app.state.config),
             ):
                 file_path = Storage.get_file(file_path)
                 result = transcribe(request, file_path, file_metadata)
@@ -195,9 +277,9 @@ def upload_file_handler(
 
     if isinstance(metadata, str):
         try:
-            metadata = json.loads(metadata)
+            metadata = orjson.loads(metadata)
             log.info(f"[UPLOAD] Parsed metadata from JSON: {metadata}")
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=ERROR_MESSAGES.DEFAULT("Invalid metadata format"),
@@ -209,19 +291,23 @@ def upload_file_handler(
         log.info(f"[UPLOAD] Google Drive file detected with metadata: {file_metadata.get('google_drive')}")
 
     try:
-        unsanitized_filename = file.filename
-        filename = os.path.basename(unsanitized_filename)
+        # Parse the name once for both the basename and the extension
+        unsanitized_path = Path(file.filename)
+        filename = unsanitized_path.name
 
-        file_extension = os.path.splitext(filename)[1]
         # Remove the leading dot from the file extension
-        file_extension = file_extension[1:] if file_extension else ""
+        file_extension = unsanitized_path.suffix[1:]
+
+        # Read the config once and filter locally; assigning the filtered list
+        # back to the persistent config would save it on every upload
+        allowed_file_extensions = (
+            request.app.state.config.ALLOWED_FILE_EXTENSIONS if process else None
+        )
 
-        if process and request.app.state.config.ALLOWED_FILE_EXTENSIONS:
-            request.app.state.config.ALLOWED_FILE_EXTENSIONS = [
-                ext for ext in request.app.state.config.ALLOWED_FILE_EXTENSIONS if ext
-            ]
+        if allowed_file_extensions:
+            allowed_file_extensions = [ext for ext in allowed_file_extensions if ext]
 
-            if file_extension not in request.app.state.config.ALLOWED_FILE_EXTENSIONS:
+            if file_extension not in allowed_file_extensions:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=ERROR_MESSAGES.DEFAULT(
@@ -229,6 +315,12 @@ def upload_file_handler(
                     ),
                 )
 
+        # Media that is never processed is marked completed at insert time,
+        # instead of scheduling a task that only updates its status
+        skip_processing = process and is_unprocessed_media_content_type(
+            request, file.content_type
+        )
+
         # replace filename with uuid
         id = str(uuid.uuid4())
         name = filename
@@ -252,7 +344,11 @@ def upload_file_handler(
                     "filename": name,
                     "path": file_path,
                     "data": {
-                        **({"status": "pending"} if process else {}),
+                        **(
+                            {"status": "completed" if skip_processing else "pending"}
+                            if process
+                            else {}
+                        ),
                     },
                     "meta": {
                         "name": name,
@@ -265,7 +361,12 @@ def upload_file_handler(
         )
 
         if process:
-            if background_tasks and process_in_background:
+            if skip_processing:
+                log.info(
+                    f"Media file uploaded but skipped for RAG processing: {file.content_type}"
+                )
+                return {"status": True, **file_item.model_dump()}
+            elif background_tasks and process_in_background:
                 background_tasks.add_task(
                     process_uploaded_file,
                     request,
@@ -328,136 +429,104 @@ async def get_media_overview(
     Only returns folders/chats that contain media files.
     Optimized for the media workspace page.
     """
-    import time
-    start_time = time.time()
+    # Get user's media files (images, videos, audio), newest first, filtered in SQL
+    media_files = Files.get_media_files_by_user_id(user.id)
     
-    # Get all user's files
-    t1 = time.time()
-    files = Files.get_files_by_user_id(user.id)
-    log.info(f"[PERF] Get all files: {(time.time() - t1)*1000:.0f}ms ({len(files)} files)")
-    
-    # Filter to media types only (images, videos, audio)
-    t2 = time.time()
-    media_types = ('image/', 'video/', 'audio/')
-    media_files = []
     file_to_chat_map = {}
-    files_without_chat = set()  # Track files needing chat resolution
-    
-    for f in files:
-        # Check if it's a media file based on content_type in meta
-        content_type = f.meta.get('content_type', '') if f.meta else ''
-        if content_type and content_type.startswith(media_types):
-            media_files.append(f)
-            # Try to get chat_id from metadata first
-            chat_id = None
-            if f.meta:
-                chat_id = f.meta.get('chat_id') or f.meta.get('source_chat_id')
-            
-            # Handle orphan files (marked as 'orphan' to skip expensive lookup)
-            if chat_id == 'orphan':
-                file_to_chat_map[f.id] = None
-            else:
-                file_to_chat_map[f.id] = chat_id
-                # Only add to files_without_chat if not marked as orphan
-                if chat_id is None:
-                    files_without_chat.add(f.id)
+    files_without_chat = {}  # Track files needing chat resolution (id -> file)
     
-    log.info(f"[PERF] Filter media files: {(time.time() - t2)*1000:.0f}ms ({len(media_files)} media, {len(files_without_chat)} need chat lookup)")
+    for f in media_files:
+        # Try to get chat_id from metadata first
+        chat_id = None
+        if f.meta:
+            chat_id = f.meta.get('chat_id') or f.meta.get('source_chat_id')
+        
+        # Handle orphan files (marked as 'orphan' to skip expensive lookup)
+        if chat_id == 'orphan':
+            file_to_chat_map[f.id] = None
+        else:
+            file_to_chat_map[f.id] = chat_id
+            # Only add to files_without_chat if not marked as orphan
+            if chat_id is None:
+                files_without_chat[f.id] = f
     
     # For files without chat_id in metadata, search chat history
     # OPTIMIZATION: Use optimized method that only loads minimal chat data
     if files_without_chat:
-        t3 = time.time()
         # Get chat associations for files without metadata
-        resolved_mappings = Chats.get_chat_ids_containing_file_ids(user.id, files_without_chat)
-        log.info(f"[PERF] Chat lookup for orphans: {(time.time() - t3)*1000:.0f}ms ({len(resolved_mappings or [])} resolved)")
+        resolved_mappings = Chats.get_chat_ids_containing_file_ids(user.id, set(files_without_chat))
         
-        # Build file dict for efficient lookup
-        file_dict = {f.id: f for f in media_files if f.id in files_without_chat}
+        # Metadata to persist so we don't need to search again, written in one batch
+        meta_updates = {}
+        orphan_count = 0
         
-        # Update file_to_chat_map and file metadata for resolved files
-        if resolved_mappings:
-            for file_id, chat_id in resolved_mappings.items():
+        # Single pass: record resolved chat_ids, mark the rest as orphans
+        resolved = resolved_mappings or {}
+        for file_id, f in files_without_chat.items():
+            if not f.meta:
+                f.meta = {}
+            
+            chat_id = resolved.get(file_id)
+            if chat_id:
                 file_to_chat_map[file_id] = chat_id
-                
                 # Update file metadata so it's available on subsequent loads
-                f = file_dict.get(file_id)
-                if f:
-                    if not f.meta:
-                        f.meta = {}
-                    f.meta['chat_id'] = chat_id
-                    
-                    # Persist to database so we don't need to search again
-                    try:
-                        Files.update_file_metadata_by_id(file_id, f.meta)
-                    except Exception as e:
-                        log.warning(f"Failed to persist chat_id for file {file_id}: {e}")
+                f.meta['chat_id'] = chat_id
+            else:
+                # Mark as orphan with special value so we don't search again
+                f.meta['chat_id'] = 'orphan'
+                orphan_count += 1
+            meta_updates[file_id] = f.meta
         
-        # Mark unresolved files as orphans so we don't search again
-        orphan_files = files_without_chat - set(resolved_mappings.keys() if resolved_mappings else [])
-        if orphan_files:
-            log.info(f"[PERF] Marking {len(orphan_files)} files as orphans (no chat found)")
-            for file_id in orphan_files:
-                f = file_dict.get(file_id)
-                if f:
-                    if not f.meta:
-                        f.meta = {}
-                    # Mark as orphan with special value so we don't search again
-                    f.meta['chat_id'] = 'orphan'
-                    try:
-                        Files.update_file_metadata_by_id(file_id, f.meta)
-                    except Exception as e:
-                        log.warning(f"Failed to mark file {file_id} as orphan: {e}")
+        if orphan_count:
+            log.debug(f"Marking {orphan_count} media files as orphans (no chat found)")
+        
+        if meta_updates and not Files.update_file_metadata_by_ids(meta_updates):
+            log.warning(f"Failed to persist chat_id for {len(meta_updates)} files")
     
     # Collect unique chat IDs (exclude None and 'orphan' marker)
-    t4 = time.time()
     chat_ids = set(cid for cid in file_to_chat_map.values() if cid is not None and cid != 'orphan')
     
     # Get only chat metadata (id, title, folder_id) - optimized to avoid loading full chat history
     chats_dict = []
     folder_ids = set()
     if chat_ids:
-        chats_dict = Chats.get_chat_metadata_by_ids(list(chat_ids))
+        chats_dict = await asyncio.to_thread(
+            Chats.get_chat_metadata_by_ids, list(chat_ids)
+        )
         # Extract folder IDs from chats
         for chat in chats_dict:
             if chat.get("folder_id"):
                 folder_ids.add(chat["folder_id"])
-    log.info(f"[PERF] Get chats: {(time.time() - t4)*1000:.0f}ms ({len(chats_dict)} chats)")
-    
-    # Get only folders that contain chats with media
-    t5 = time.time()
-    folders = []
-    if folder_ids:
-        folders = Folders.get_folders_by_ids(list(folder_ids))
-    log.info(f"[PERF] Get folders: {(time.time() - t5)*1000:.0f}ms ({len(folders)} folders)")
     
-    # Sort files by updated_at (newest first) before pagination
-    t6 = time.time()
-    media_files.sort(key=lambda f: f.updated_at if hasattr(f, 'updated_at') and f.updated_at else 0, reverse=True)
-    log.info(f"[PERF] Sort files: {(time.time() - t6)*1000:.0f}ms")
-    
-    # Apply pagination if requested
+    # Apply pagination if requested (files are already sorted newest first)
     total_files = len(media_files)
     if limit > 0:
         media_files = media_files[skip : skip + limit]
     
-    # Convert files and folders to dicts for response (chats already dicts from get_chat_metadata_by_ids)
-    t7 = time.time()
-    files_dict = [f.model_dump() for f in media_files]
-    folders_dict = [folder.model_dump() for folder in folders]
-    log.info(f"[PERF] Serialize to dicts: {(time.time() - t7)*1000:.0f}ms")
+    # Get only folders that contain chats with media
+    async def get_folders():
+        if not folder_ids:
+            return []
+        return await asyncio.to_thread(Folders.get_folders_by_ids, list(folder_ids))
     
-    total_time = (time.time() - start_time) * 1000
-    log.info(f"[PERF] media-overview TOTAL: {total_time:.0f}ms (skip={skip}, limit={limit}, returned {len(files_dict)} files)")
+    # Overlap the folder query with converting files to dicts for the response
+    # (chats already dicts from get_chat_metadata_by_ids)
+    folders, files_dict = await asyncio.gather(
+        get_folders(),
+        asyncio.to_thread(FILE_LIST_ADAPTER.dump_python, media_files),
+    )
+    folders_dict = FOLDER_LIST_ADAPTER.dump_python(folders)
     
-    return {
-        "files": files_dict,
-        "chats": chats_dict,
-        "folders": folders_dict,
-        "total": total_files,
-        "skip": skip,
-        "limit": limit if limit > 0 else total_files,
-    }
+    return ORJSONResponse(
+        {
+            "files": files_dict,
+            "chats": chats_dict,
+            "folders": folders_dict,
+            "total": total_files,
+            "skip": skip,
+            "limit": limit if limit > 0 else total_files,
+        }
+    )
 
 
 ############################
@@ -477,7 +546,9 @@ async def list_files(user=Depends(get_verified_user), content: bool = Query(True
             if "content" in file.data:
                 del file.data["content"]
 
-    return files
+    # Serialize straight to bytes instead of re-validating every file against
+    # the response model and encoding with the stdlib json encoder
+    return ORJSONResponse(FILE_LIST_ADAPTER.dump_python(files))
 
 
 ############################
@@ -519,7 +590,7 @@ async def search_files(
             if "content" in file.data:
                 del file.data["content"]
 
-    return matching_files
+    return ORJSONResponse(FILE_LIST_ADAPTER.dump_python(matching_files))
 
 
 ############################
@@ -533,6 +604,7 @@ async def delete_all_files(user=Depends(get_admin_user)):
     if result:
         try:
             Storage.delete_all_files()
+            _storage_file_cache.clear()
             VECTOR_DB_CLIENT.reset()
         except Exception as e:
             log.exception(e)
@@ -567,7 +639,7 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "read", user)
+        or has_access_to_file(id, "read", user, file=file)
     ):
         return file
     else:
@@ -592,17 +664,25 @@ async def get_file_process_status(
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "read", user)
+        or has_access_to_file(id, "read", user, file=file)
     ):
         if stream:
-            MAX_FILE_PROCESSING_DURATION = 3600 * 2
+            MAX_FILE_PROCESSING_DURATION = 3600
+            # Status updates made by other workers are not published to this
+            # process, so fall back to reading the database at this interval
+            FILE_STATUS_POLL_INTERVAL = 5
 
             async def event_stream(file_item):
                 if file_item:
-                    for _ in range(MAX_FILE_PROCESSING_DURATION):
-                        file_item = Files.get_file_by_id(file_item.id)
-                        if file_item:
-                            data = file_item.model_dump().get("data", {})
+                    file_id = file_item.id
+                    with subscribe_file_status(file_id) as updates:
+                        deadline = time.monotonic() + MAX_FILE_PROCESSING_DURATION
+
+                        # Re-read after subscribing so no update is missed in between
+                        file_item = Files.get_file_by_id(file_id)
+                        data = (file_item.data if file_item else None) or {}
+
+                        while True:
                             status = data.get("status")
 
                             if status:
@@ -610,16 +690,34 @@ async def get_file_process_status(
                                 if status == "failed":
                                     event["error"] = data.get("error")
 
-                                yield f"data: {json.dumps(event)}\n\n"
+                                yield f"data: {orjson.dumps(event).decode()}\n\n"
                                 if status in ("completed", "failed"):
                                     break
                             else:
-                                # Legacy
+                                # Legacy, or the file no longer exists
                                 break
 
-                        await asyncio.sleep(0.5)
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+
+                            try:
+                                data = await asyncio.wait_for(
+                                    updates.get(),
+                                    timeout=min(FILE_STATUS_POLL_INTERVAL, remaining),
+                                )
+
+                                # Coalesce a burst of updates into one frame
+                                # carrying only the latest state
+                                while True:
+                                    data = updates.get_nowait()
+                            except asyncio.QueueEmpty:
+                                pass
+                            except asyncio.TimeoutError:
+                                file_item = Files.get_file_by_id(file_id)
+                                data = (file_item.data if file_item else None) or {}
                 else:
-                    yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
+                    yield f"data: {orjson.dumps({'status': 'not_found'}).decode()}\n\n"
 
             return StreamingResponse(
                 event_stream(file),
@@ -652,7 +750,7 @@ async def get_file_data_content_by_id(id: str, user=Depends(get_verified_user)):
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "read", user)
+        or has_access_to_file(id, "read", user, file=file)
     ):
         return {"content": file.data.get("content", "")}
     else:
@@ -686,7 +784,7 @@ async def update_file_data_content_by_id(
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "write", user)
+        or has_access_to_file(id, "write", user, file=file)
     ):
         try:
             process_file(
@@ -727,14 +825,12 @@ async def get_file_content_by_id(
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "read", user)
+        or has_access_to_file(id, "read", user, file=file)
     ):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
-
             # Check if the file already exists in the cache
-            if file_path.is_file():
+            file_path, stat_result = await get_local_storage_file(file.path)
+            if stat_result:
                 # Handle Unicode filenames
                 filename = file.meta.get("name", file.filename)
                 encoded_filename = quote(filename)  # RFC5987 encoding
@@ -761,7 +857,12 @@ async def get_file_content_by_id(
                             f"attachment; filename*=UTF-8''{encoded_filename}"
                         )
 
-                return FileResponse(file_path, headers=headers, media_type=content_type)
+                return ContentFileResponse(
+                    file_path,
+                    headers=headers,
+                    media_type=content_type,
+                    stat_result=stat_result,
+                )
 
             else:
                 raise HTTPException(
@@ -802,16 +903,14 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "read", user)
+        or has_access_to_file(id, "read", user, file=file)
     ):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
-
             # Check if the file already exists in the cache
-            if file_path.is_file():
+            file_path, stat_result = await get_local_storage_file(file.path)
+            if stat_result:
                 log.info(f"file_path: {file_path}")
-                return FileResponse(file_path)
+                return ContentFileResponse(file_path, stat_result=stat_result)
             else:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -844,7 +943,7 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "read", user)
+        or has_access_to_file(id, "read", user, file=file)
     ):
         file_path = file.path
 
@@ -856,12 +955,12 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
         }
 
         if file_path:
-            file_path = Storage.get_file(file_path)
-            file_path = Path(file_path)
-
             # Check if the file already exists in the cache
-            if file_path.is_file():
-                return FileResponse(file_path, headers=headers)
+            file_path, stat_result = await get_local_storage_file(file_path)
+            if stat_result:
+                return ContentFileResponse(
+                    file_path, headers=headers, stat_result=stat_result
+                )
             else:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -906,13 +1005,14 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
     if (
         file.user_id == user.id
         or user.role == "admin"
-        or has_access_to_file(id, "write", user)
+        or has_access_to_file(id, "write", user, file=file)
     ):
 
         result = Files.delete_file_by_id(id)
         if result:
             try:
                 Storage.delete_file(file.path)
+                _storage_file_cache.pop(file.path, None)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
             except Exception as e:
                 log.exception(e)
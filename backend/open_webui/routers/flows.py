@@ -1,16 +1,23 @@
+import hashlib
 from typing import Optional
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
 
 from open_webui.models.flows import (
     FlowForm,
+    FlowImportForm,
     FlowUpdateForm,
     FlowResponse,
     FlowListResponse,
-    FlowUserResponse,
+    FlowSummaryResponse,
     FlowModel,
     Flows,
 )
 from open_webui.models.groups import Groups
+from open_webui.models.users import UserModel
 from open_webui.utils.access_control import has_access
 from open_webui.models.flow_executions import (
     FlowExecutionForm,
@@ -20,37 +27,51 @@ from open_webui.models.flow_executions import (
     FlowExecutions,
 )
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.auth import get_verified_user
+from open_webui.utils.flow_executions import enqueue_flow_execution
+from open_webui.utils.misc import is_not_modified
 
 router = APIRouter()
 
+# Upper bound for an imported flow document
+MAX_FLOW_IMPORT_SIZE = 10 * 1024 * 1024  # 10MB
+
+
+def model_json_response(model: BaseModel, status_code: int = 200) -> Response:
+    # pydantic-core encodes the model straight to JSON bytes, skipping the
+    # intermediate dict that model_dump() + a JSON encoder would build
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 ############################
 # GetFlows
 ############################
 
 
+def get_flow_list_page(page: Optional[int]) -> dict:
+    # Without a page the whole list is returned, as before
+    if page is None:
+        return {}
+
+    limit = 60
+    return {"skip": (max(page, 1) - 1) * limit, "limit": limit}
+
+
 @router.get("/", response_model=list[FlowListResponse])
-async def get_flows(user=Depends(get_verified_user)):
+async def get_flows(page: Optional[int] = None, user=Depends(get_verified_user)):
     """
     Get all flows the user can write (owns or has write access)
     Used for workspace/flows list
     """
-    flows = Flows.get_flows_by_user_id(user.id, permission="write")
-    
-    return [
-        FlowListResponse(
-            id=flow.id,
-            name=flow.name,
-            description=flow.description,
-            nodes=flow.nodes,
-            edges=flow.edges,
-            created_at=flow.created_at,
-            updated_at=flow.updated_at,
-            meta=flow.meta,
-            access_control=flow.access_control,
+    return ORJSONResponse(
+        Flows.get_flow_list_by_user_id(
+            user.id, permission="write", **get_flow_list_page(page)
         )
-        for flow in flows
-    ]
+    )
 
 
 ############################
@@ -58,28 +79,20 @@ async def get_flows(user=Depends(get_verified_user)):
 ############################
 
 
-@router.get("/accessible", response_model=list[FlowListResponse])
-async def get_accessible_flows(user=Depends(get_verified_user)):
+@router.get("/accessible", response_model=list[FlowSummaryResponse])
+async def get_accessible_flows(
+    page: Optional[int] = None, user=Depends(get_verified_user)
+):
     """
     Get all flows the user can read (owns or has read access)
-    Used for chat interface flow selector
-    """
-    flows = Flows.get_flows_by_user_id(user.id, permission="read")
-    
-    return [
-        FlowListResponse(
-            id=flow.id,
-            name=flow.name,
-            description=flow.description,
-            nodes=flow.nodes,
-            edges=flow.edges,
-            created_at=flow.created_at,
-            updated_at=flow.updated_at,
-            meta=flow.meta,
-            access_control=flow.access_control,
+    Used for chat interface flow selector, which fetches a flow's nodes and
+    edges by id only when it runs it
+    """
+    return ORJSONResponse(
+        Flows.get_flow_list_by_user_id(
+            user.id, permission="read", summary=True, **get_flow_list_page(page)
         )
-        for flow in flows
-    ]
+    )
 
 
 ############################
@@ -98,18 +111,7 @@ async def create_new_flow(
         flow = Flows.insert_new_flow(user.id, form_data)
 
         if flow:
-            return FlowResponse(
-                id=flow.id,
-                user_id=flow.user_id,
-                name=flow.name,
-                description=flow.description,
-                nodes=flow.nodes,
-                edges=flow.edges,
-                created_at=flow.created_at,
-                updated_at=flow.updated_at,
-                meta=flow.meta,
-                access_control=flow.access_control,
-            )
+            return model_json_response(flow)
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -123,33 +125,44 @@ async def create_new_flow(
 
 
 def has_flow_access(
-    user_id: str, user_role: str, flow: FlowModel, permission: str = "read"
+    user_id: str,
+    user_role: str,
+    flow: FlowModel,
+    permission: str = "read",
+    user_group_ids: Optional[set[str]] = None,
 ) -> bool:
     """
     Check if user has access to a flow.
     Admins always have access. Owners always have access.
     Others need explicit access_control permission.
+    Callers checking several flows can pass the user's group ids once.
     """
     if user_role == "admin":
         return True
     if flow.user_id == user_id:
         return True
-    
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
-    return has_access(user_id, permission, flow.access_control, user_group_ids)
-
 
-############################
-# GetFlowById
-############################
+    # Group membership only matters for the groups the flow grants this
+    # permission to; public (no access_control) and user-only grants skip the
+    # query, otherwise only those groups are checked
+    if user_group_ids is None:
+        permitted_group_ids = (
+            (flow.access_control or {}).get(permission, {}).get("group_ids")
+        )
+        user_group_ids = Groups.get_member_group_ids(user_id, permitted_group_ids)
+    return has_access(user_id, permission, flow.access_control, user_group_ids)
 
 
-@router.get("/{id}", response_model=Optional[FlowResponse])
-async def get_flow_by_id(id: str, user=Depends(get_verified_user)):
+def get_flow_for_user(
+    flow_id: str, user: UserModel, permission: str = "read"
+) -> FlowModel:
     """
-    Get a specific flow by ID
+    Get a flow the user has the given permission on.
+    Raises 404 if the flow does not exist and 403 if the user lacks access.
     """
-    flow = Flows.get_flow_by_id(id)
+    # Owner and access_control come from the database even when the flow's
+    # content is cached, so changes made on other workers apply at once
+    flow = Flows.get_flow_by_id(flow_id)
 
     if not flow:
         raise HTTPException(
@@ -157,25 +170,51 @@ async def get_flow_by_id(id: str, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    # Check if user has read access
-    if not has_flow_access(user.id, user.role, flow, "read"):
+    if not has_flow_access(user.id, user.role, flow, permission):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    return FlowResponse(
-        id=flow.id,
-        user_id=flow.user_id,
-        name=flow.name,
-        description=flow.description,
-        nodes=flow.nodes,
-        edges=flow.edges,
-        created_at=flow.created_at,
-        updated_at=flow.updated_at,
-        meta=flow.meta,
-        access_control=flow.access_control,
-    )
+    return flow
+
+
+def get_flow_etag(flow_json: str) -> str:
+    # A hash of the flow's content: updated_at is in whole seconds, so two
+    # saves within a second (autosave, then a manual save) would share it
+    return f'"{hashlib.sha1(flow_json.encode()).hexdigest()}"'
+
+
+async def get_readable_flow(
+    flow_id: str, user=Depends(get_verified_user)
+) -> FlowModel:
+    """
+    Dependency resolving the {flow_id} path parameter to a flow the user can read
+    """
+    return get_flow_for_user(flow_id, user, "read")
+
+
+############################
+# GetFlowById
+############################
+
+
+@router.get("/{flow_id}", response_model=Optional[FlowResponse])
+async def get_flow_by_id(
+    request: Request, flow: FlowModel = Depends(get_readable_flow)
+):
+    """
+    Get a specific flow by ID
+    Supports conditional requests: an unchanged flow is answered with 304
+    """
+    flow_json = flow.model_dump_json()
+    etag = get_flow_etag(flow_json)
+    headers = {"ETag": etag, "Cache-Control": "private, must-revalidate"}
+
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=flow_json, media_type="application/json", headers=headers)
 
 
 ############################
@@ -192,36 +231,18 @@ async def update_flow_by_id(
     """
     Update a flow by ID
     """
-    flow = Flows.get_flow_by_id(id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
+    # Owners and admins are authorized by the update itself
+    updated_flow = Flows.update_flow_by_id_for_user(
+        id, user.id, user.is_admin, form_data
+    )
 
-    # Check if user has write access
-    if not has_flow_access(user.id, user.role, flow, "write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
+    if not updated_flow:
+        get_flow_for_user(id, user, "write")
+
+        updated_flow = Flows.update_flow_by_id(id, form_data)
 
-    updated_flow = Flows.update_flow_by_id(id, form_data)
-    
     if updated_flow:
-        return FlowResponse(
-            id=updated_flow.id,
-            user_id=updated_flow.user_id,
-            name=updated_flow.name,
-            description=updated_flow.description,
-            nodes=updated_flow.nodes,
-            edges=updated_flow.edges,
-            created_at=updated_flow.created_at,
-            updated_at=updated_flow.updated_at,
-            meta=updated_flow.meta,
-            access_control=updated_flow.access_control,
-        )
+        return model_json_response(updated_flow)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -242,36 +263,18 @@ async def duplicate_flow_by_id(
     """
     Duplicate a flow by ID
     """
-    flow = Flows.get_flow_by_id(id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
+    # Owners and admins are authorized by the duplicate itself
+    duplicated_flow = Flows.duplicate_flow_by_id_for_user(
+        id, user.id, user.is_admin
+    )
 
-    # Check if user has read access (can duplicate if can read)
-    if not has_flow_access(user.id, user.role, flow, "read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
+    if not duplicated_flow:
+        get_flow_for_user(id, user, "read")
+
+        duplicated_flow = Flows.duplicate_flow_by_id(id, user.id)
 
-    duplicated_flow = Flows.duplicate_flow_by_id(id, user.id)
-    
     if duplicated_flow:
-        return FlowResponse(
-            id=duplicated_flow.id,
-            user_id=duplicated_flow.user_id,
-            name=duplicated_flow.name,
-            description=duplicated_flow.description,
-            nodes=duplicated_flow.nodes,
-            edges=duplicated_flow.edges,
-            created_at=duplicated_flow.created_at,
-            updated_at=duplicated_flow.updated_at,
-            meta=duplicated_flow.meta,
-            access_control=duplicated_flow.access_control,
-        )
+        return model_json_response(duplicated_flow)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -289,23 +292,21 @@ async def delete_flow_by_id(id: str, user=Depends(get_verified_user)):
     """
     Delete a flow by ID (only owner or admin can delete)
     """
-    flow = Flows.get_flow_by_id(id)
-    
-    if not flow:
+    # Only owner or admin can delete, enforced by the DELETE statement itself
+    if Flows.delete_flow_by_id_for_user(id, user.id, user.is_admin):
+        return True
+
+    # Nothing was deleted, tell a missing flow apart from someone else's
+    if not Flows.get_flow_by_id(id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    # Only owner or admin can delete
-    if flow.user_id != user.id and user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
-
-    result = Flows.delete_flow_by_id(id)
-    return result
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+    )
 
 
 ############################
@@ -313,37 +314,34 @@ async def delete_flow_by_id(id: str, user=Depends(get_verified_user)):
 ############################
 
 
-@router.get("/{id}/export")
-async def export_flow_by_id(id: str, user=Depends(get_verified_user)):
+@router.get("/{flow_id}/export")
+async def export_flow_by_id(
+    request: Request, flow: FlowModel = Depends(get_readable_flow)
+):
     """
     Export a flow as JSON
-    """
-    flow = Flows.get_flow_by_id(id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
-
-    # Check if user has read access
-    if not has_flow_access(user.id, user.role, flow, "read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
-
-    return {
-        "version": "1.0",
-        "flow": {
-            "name": flow.name,
-            "description": flow.description,
-            "nodes": flow.nodes,
-            "edges": flow.edges,
-            "meta": flow.meta,
+    Supports conditional requests: an unchanged flow is answered with 304
+    """
+    etag = get_flow_etag(flow.model_dump_json())
+    headers = {"ETag": etag, "Cache-Control": "private, must-revalidate"}
+
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return ORJSONResponse(
+        {
+            "version": "1.0",
+            "flow": {
+                "name": flow.name,
+                "description": flow.description,
+                "nodes": flow.nodes,
+                "edges": flow.edges,
+                "meta": flow.meta,
+            },
+            "exportedAt": flow.updated_at,
         },
-        "exportedAt": flow.updated_at,
-    }
+        headers=headers,
+    )
 
 
 ############################
@@ -354,12 +352,44 @@ async def export_flow_by_id(id: str, user=Depends(get_verified_user)):
 @router.post("/import", response_model=Optional[FlowResponse])
 async def import_flow(
     request: Request,
-    flow_data: dict,
     user=Depends(get_verified_user),
 ):
     """
     Import a flow from JSON
     """
+    # Flow exports can be large, parse the body with orjson ourselves
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > MAX_FLOW_IMPORT_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=ERROR_MESSAGES.DEFAULT("Flow import is too large"),
+            )
+
+    # Content-Length may be missing (chunked uploads) or wrong, so count the
+    # bytes while reading and stop as soon as the cap is passed
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_FLOW_IMPORT_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=ERROR_MESSAGES.DEFAULT("Flow import is too large"),
+            )
+        chunks.append(chunk)
+
+    try:
+        flow_data: FlowImportForm = orjson.loads(b"".join(chunks))
+    except orjson.JSONDecodeError:
+        flow_data = None
+
+    if not isinstance(flow_data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import failed: invalid flow JSON",
+        )
+
     try:
         # Extract flow data from import format
         if "flow" in flow_data:
@@ -367,7 +397,9 @@ async def import_flow(
         else:
             flow_content = flow_data
 
-        form_data = FlowForm(
+        # Skip validating the form here: insert_new_flow validates the same
+        # fields again when it builds the FlowModel, and rejects bad shapes
+        form_data = FlowForm.model_construct(
             name=flow_content.get("name", "Imported Flow"),
             description=flow_content.get("description"),
             nodes=flow_content.get("nodes", []),
@@ -377,18 +409,7 @@ async def import_flow(
         flow = Flows.insert_new_flow(user.id, form_data)
 
         if flow:
-            return FlowResponse(
-                id=flow.id,
-                user_id=flow.user_id,
-                name=flow.name,
-                description=flow.description,
-                nodes=flow.nodes,
-                edges=flow.edges,
-                created_at=flow.created_at,
-                updated_at=flow.updated_at,
-                meta=flow.meta,
-                access_control=flow.access_control,
-            )
+            return model_json_response(flow)
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -406,37 +427,25 @@ async def import_flow(
 ############################
 
 
-@router.post("/{id}/execute")
+@router.post("/{flow_id}/execute")
 async def execute_flow_by_id(
-    id: str,
     inputs: dict,
-    user=Depends(get_verified_user),
+    flow: FlowModel = Depends(get_readable_flow),
 ):
     """
     Execute a flow (placeholder for future server-side execution)
     Currently, flows are executed client-side
     """
-    flow = Flows.get_flow_by_id(id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
-
-    # Check if user has read access to execute
-    if not has_flow_access(user.id, user.role, flow, "read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
-
-    # For now, return a message that execution happens client-side
-    return {
-        "message": "Flow execution is handled client-side",
-        "flowId": id,
-        "status": "delegated_to_client",
-    }
+    # For now, return a message that execution happens client-side. The flow
+    # is still resolved, so unknown or unreadable flows get 404/403 like the
+    # other /{flow_id} routes
+    return ORJSONResponse(
+        {
+            "message": "Flow execution is handled client-side",
+            "flowId": flow.id,
+            "status": "delegated_to_client",
+        }
+    )
 
 
 ############################
@@ -446,51 +455,32 @@ async def execute_flow_by_id(
 
 @router.post("/{flow_id}/executions", response_model=Optional[FlowExecutionResponse])
 async def create_flow_execution(
-    flow_id: str,
     form_data: FlowExecutionForm,
+    flow: FlowModel = Depends(get_readable_flow),
     user=Depends(get_verified_user),
 ):
     """
     Save a flow execution result
+    The execution is normally queued for a batched write and answered with 202
+    before it is saved, so it may show up in the history shortly after this
+    returns: reading it back right away (GET /{flow_id}/executions/{id}) can
+    still 404. If it can't be queued it is saved first and answered with 200
     """
-    # Verify flow exists and user has access
-    flow = Flows.get_flow_by_id(flow_id)
-    
-    if not flow:
+    # Access was checked for the flow in the path; the execution must be for it
+    if form_data.flow_id != flow.id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Execution flow_id does not match the flow"),
         )
 
-    # Check if user has read access to save execution
-    if not has_flow_access(user.id, user.role, flow, "read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
+    execution = FlowExecutions.build_new_execution(user.id, form_data)
+    if enqueue_flow_execution(execution):
+        return model_json_response(execution, status_code=status.HTTP_202_ACCEPTED)
 
+    # The writer is not running or is backed up, save it right away
     try:
-        execution = FlowExecutions.insert_new_execution(user.id, form_data)
-
-        if execution:
-            return FlowExecutionResponse(
-                id=execution.id,
-                flow_id=execution.flow_id,
-                user_id=execution.user_id,
-                status=execution.status,
-                inputs=execution.inputs,
-                outputs=execution.outputs,
-                node_results=execution.node_results,
-                errors=execution.errors,
-                execution_time=execution.execution_time,
-                created_at=execution.created_at,
-                meta=execution.meta,
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ERROR_MESSAGES.DEFAULT(),
-            )
+        FlowExecutions.insert_executions([execution])
+        return model_json_response(execution)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -498,75 +488,60 @@ async def create_flow_execution(
         )
 
 
+def parse_execution_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        created_at, id = cursor.split(":", 1)
+        return int(created_at), id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid cursor"),
+        )
+
+
 @router.get("/{flow_id}/executions", response_model=list[FlowExecutionListResponse])
 async def get_flow_executions(
-    flow_id: str,
     page: Optional[int] = 1,
-    user=Depends(get_verified_user),
+    cursor: Optional[str] = None,
+    flow: FlowModel = Depends(get_readable_flow),
 ):
     """
     Get execution history for a flow (paginated)
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next page
+    with keyset pagination; `page` is kept for offset-based clients
     """
-    # Verify flow exists and user has access
-    flow = Flows.get_flow_by_id(flow_id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
+    limit = 60
 
-    # Check if user has read access
-    if not has_flow_access(user.id, user.role, flow, "read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+    if cursor:
+        cursor_created_at, cursor_id = parse_execution_cursor(cursor)
+        executions = FlowExecutions.get_execution_list_by_flow_id(
+            flow.id,
+            limit=limit,
+            cursor_created_at=cursor_created_at,
+            cursor_id=cursor_id,
+        )
+    else:
+        skip = (page - 1) * limit if page else 0
+        executions = FlowExecutions.get_execution_list_by_flow_id(
+            flow.id, skip=skip, limit=limit
         )
 
-    limit = 60
-    skip = (page - 1) * limit if page else 0
+    response = ORJSONResponse(executions)
 
-    executions = FlowExecutions.get_executions_by_flow_id(
-        flow_id, skip=skip, limit=limit
-    )
-    
-    return [
-        FlowExecutionListResponse(
-            id=execution.id,
-            flow_id=execution.flow_id,
-            status=execution.status,
-            execution_time=execution.execution_time,
-            created_at=execution.created_at,
-        )
-        for execution in executions
-    ]
+    # A full page may be followed by more, hand out the cursor of its last row
+    if len(executions) == limit:
+        last = executions[-1]
+        response.headers["X-Next-Cursor"] = f"{last['created_at']}:{last['id']}"
+
+    return response
 
 
 @router.get("/{flow_id}/executions/stats", response_model=FlowExecutionStatsResponse)
-async def get_flow_execution_stats(
-    flow_id: str,
-    user=Depends(get_verified_user),
-):
+async def get_flow_execution_stats(flow: FlowModel = Depends(get_readable_flow)):
     """
     Get execution statistics for a flow
     """
-    # Verify flow exists and user has access
-    flow = Flows.get_flow_by_id(flow_id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
-
-    # Check if user has read access
-    if not has_flow_access(user.id, user.role, flow, "read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
-
-    return FlowExecutions.get_execution_stats_by_flow_id(flow_id)
+    return ORJSONResponse(FlowExecutions.get_execution_stats_by_flow_id(flow.id))
 
 
 @router.get("/{flow_id}/executions/{execution_id}", response_model=Optional[FlowExecutionResponse])
@@ -578,50 +553,25 @@ async def get_flow_execution_by_id(
     """
     Get a specific flow execution result
     """
-    # Verify flow exists and user has access
-    flow = Flows.get_flow_by_id(flow_id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
-
-    # Check if user has read access
-    if not has_flow_access(user.id, user.role, flow, "read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
+    # Owners and admins get the execution in a single query
+    execution = FlowExecutions.get_execution_for_user(
+        execution_id, flow_id, user.id, user.is_admin
+    )
 
-    execution = FlowExecutions.get_execution_by_id(execution_id)
-    
     if not execution:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Execution not found",
-        )
-    
-    # Verify execution belongs to the flow
-    if execution.flow_id != flow_id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Execution not found for this flow",
+        get_flow_for_user(flow_id, user, "read")
+
+        execution = FlowExecutions.get_execution_by_id_and_flow_id(
+            execution_id, flow_id
         )
 
-    return FlowExecutionResponse(
-        id=execution.id,
-        flow_id=execution.flow_id,
-        user_id=execution.user_id,
-        status=execution.status,
-        inputs=execution.inputs,
-        outputs=execution.outputs,
-        node_results=execution.node_results,
-        errors=execution.errors,
-        execution_time=execution.execution_time,
-        created_at=execution.created_at,
-        meta=execution.meta,
-    )
+        if not execution:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Execution not found for this flow",
+            )
+
+    return model_json_response(execution)
 
 
 @router.delete("/{flow_id}/executions/{execution_id}", response_model=bool)
@@ -633,39 +583,22 @@ async def delete_flow_execution(
     """
     Delete a specific flow execution
     """
-    # Verify flow exists and user has access
-    flow = Flows.get_flow_by_id(flow_id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
+    # Owners and admins delete the execution in a single statement
+    if FlowExecutions.delete_execution_by_id_for_user(
+        execution_id, flow_id, user.id, user.is_admin
+    ):
+        return True
 
-    # Check if user has write access to delete executions
-    if not has_flow_access(user.id, user.role, flow, "write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
-    
-    execution = FlowExecutions.get_execution_by_id(execution_id)
-    
-    if not execution:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Execution not found",
-        )
-    
-    # Verify execution belongs to the flow
-    if execution.flow_id != flow_id:
+    get_flow_for_user(flow_id, user, "write")
+
+    # The flow predicate is part of the DELETE, no separate lookup needed
+    if not FlowExecutions.delete_execution_by_id_and_flow_id(execution_id, flow_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Execution not found for this flow",
         )
 
-    result = FlowExecutions.delete_execution_by_id(execution_id)
-    return result
+    return True
 
 
 @router.delete("/{flow_id}/executions", response_model=bool)
@@ -676,21 +609,14 @@ async def delete_all_flow_executions(
     """
     Delete all executions for a flow
     """
-    # Verify flow exists and user has access
-    flow = Flows.get_flow_by_id(flow_id)
-    
-    if not flow:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
+    # Owners and admins delete the executions in a single statement
+    if FlowExecutions.delete_executions_by_flow_id_for_user(
+        flow_id, user.id, user.is_admin
+    ):
+        return True
 
-    # Check if user has write access to delete executions
-    if not has_flow_access(user.id, user.role, flow, "write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
+    # Nothing was deleted; verify flow exists and user has access
+    get_flow_for_user(flow_id, user, "write")
 
     result = FlowExecutions.delete_executions_by_flow_id(flow_id)
     return result
@@ -1,16 +1,92 @@
+import asyncio
+import html
+import json
+import time
+from collections import Counter
+from string import Template
 from typing import Optional
 from fastapi import APIRouter, Depends, Request, Response, HTTPException
 from pydantic import BaseModel
 import logging
 
+from open_webui.models.files import Files
 from open_webui.models.users import Users
 from open_webui.utils.auth import get_verified_user
 from open_webui.models.oauth_sessions import OAuthSessions
+from open_webui.utils.google_drive_sync import sync_drive_file
+from open_webui.env import GOOGLE_DRIVE_SYNC_CONCURRENCY
 
 log = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Drive files loaded and synced per round in sync-all
+GOOGLE_DRIVE_SYNC_BATCH_SIZE = 100
+
+# /status is polled by the UI; remember each user's answer for a short while
+# so polling doesn't hit the DB every time. Authorizing or revoking here drops
+# the entry, the TTL bounds staleness for changes made by other workers
+AUTH_STATUS_CACHE_TTL = 30
+AUTH_STATUS_CACHE_MAX_SIZE = 10_000
+_auth_status_cache: dict[str, tuple[float, dict]] = {}
+
+
+def get_auth_status(user_id: str) -> dict:
+    now = time.monotonic()
+
+    cached = _auth_status_cache.get(user_id)
+    if cached and now - cached[0] < AUTH_STATUS_CACHE_TTL:
+        return cached[1]
+
+    session = OAuthSessions.get_session_by_provider_and_user_id("google_drive", user_id)
+    status = {
+        "authorized": session is not None,
+        "expires_at": session.expires_at if session else None
+    }
+
+    _auth_status_cache.pop(user_id, None)
+    if len(_auth_status_cache) >= AUTH_STATUS_CACHE_MAX_SIZE:
+        # Evict the oldest entry
+        _auth_status_cache.pop(next(iter(_auth_status_cache)))
+    _auth_status_cache[user_id] = (now, status)
+
+    return status
+
+# Popup pages returned by the OAuth callback; they report back to the opener
+# and close themselves
+AUTH_SUCCESS_HTML = """
+            <html>
+                <body>
+                    <script>
+                        window.opener.postMessage({type: 'google_drive_auth_success'}, '*');
+                        window.close();
+                    </script>
+                    <p>Authorization successful! You can close this window.</p>
+                </body>
+            </html>
+            """
+
+AUTH_ERROR_HTML = Template("""
+            <html>
+                <body>
+                    <script>
+                        window.opener.postMessage({type: 'google_drive_auth_error', error: $error_js}, '*');
+                        window.close();
+                    </script>
+                    <p>Authorization failed: $error_html</p>
+                </body>
+            </html>
+            """)
+
+
+def render_auth_error_html(error: str) -> str:
+    return AUTH_ERROR_HTML.substitute(
+        # A JSON string is a valid JS literal; "<" is escaped so the error
+        # can't close the script tag
+        error_js=json.dumps(error).replace("<", "\\u003c"),
+        error_html=html.escape(error),
+    )
+
 
 class GoogleDriveTokenResponse(BaseModel):
     access_token: str
@@ -59,36 +135,14 @@ async def google_drive_oauth_callback(
             user_id=user.id,
             response=response
         )
+        _auth_status_cache.pop(user.id, None)
         
         # Redirect back to the knowledge base with success message
-        return Response(
-            content="""
-            <html>
-                <body>
-                    <script>
-                        window.opener.postMessage({type: 'google_drive_auth_success'}, '*');
-                        window.close();
-                    </script>
-                    <p>Authorization successful! You can close this window.</p>
-                </body>
-            </html>
-            """,
-            media_type="text/html"
-        )
+        return Response(content=AUTH_SUCCESS_HTML, media_type="text/html")
     except Exception as e:
         log.error(f"Google Drive OAuth callback failed: {e}")
         return Response(
-            content=f"""
-            <html>
-                <body>
-                    <script>
-                        window.opener.postMessage({{type: 'google_drive_auth_error', error: '{str(e)}'}}, '*');
-                        window.close();
-                    </script>
-                    <p>Authorization failed: {str(e)}</p>
-                </body>
-            </html>
-            """,
+            content=render_auth_error_html(str(e)),
             media_type="text/html"
         )
 
@@ -140,10 +194,12 @@ async def revoke_google_drive_access(
     client_id = "google_drive"
     
     try:
-        # Delete the OAuth session
+        # Delete the OAuth session; looked up fresh rather than from the status
+        # cache so a session created by another worker isn't missed
         session = OAuthSessions.get_session_by_provider_and_user_id(client_id, user.id)
         if session:
             OAuthSessions.delete_session_by_id(session.id)
+            _auth_status_cache.pop(user.id, None)
             log.info(f"Revoked Google Drive access for user {user.id}")
             return {"message": "Google Drive access revoked successfully"}
         else:
@@ -161,14 +217,8 @@ async def google_drive_auth_status(
     """
     Check if user has authorized Google Drive access.
     """
-    client_id = "google_drive"
-    
     try:
-        session = OAuthSessions.get_session_by_provider_and_user_id(client_id, user.id)
-        return {
-            "authorized": session is not None,
-            "expires_at": session.expires_at if session else None
-        }
+        return get_auth_status(user.id)
     except Exception as e:
         log.error(f"Failed to check Google Drive auth status: {e}")
         return {"authorized": False, "expires_at": None}
@@ -184,9 +234,6 @@ async def sync_all_google_drive_files(
     Checks all files with driveMetadata and updates them if modified.
     """
     try:
-        from open_webui.models.files import Files
-        from open_webui.utils.google_drive_sync import sync_drive_file
-        
         # Get access token
         client_id = "google_drive"
         token_data = await request.app.state.oauth_client_manager.get_oauth_token(
@@ -203,19 +250,42 @@ async def sync_all_google_drive_files(
         
         access_token = token_data["access_token"]
         
-        # Find all files owned by user with Drive metadata
+        # Each sync is a round-trip to Drive, so run them concurrently; the
+        # cap keeps a large library from tripping Drive's rate limits
+        semaphore = asyncio.Semaphore(GOOGLE_DRIVE_SYNC_CONCURRENCY)
+
+        async def sync_one(file) -> str:
+            async with semaphore:
+                try:
+                    result = await sync_drive_file(file, access_token, request=request, user=user)
+                    return "updated" if result.get("updated") else "unchanged"
+                except Exception as e:
+                    log.error(f"Failed to sync file {file.id}: {e}")
+                    return "failed"
+
+        # Find all files owned by user with Drive metadata, a batch at a time
+        # so a large library is never held in memory at once
         # Note: Files are stored with nested structure: meta.data.source and meta.data.google_drive
-        all_files = Files.get_files()
-        user_drive_files = [
-            f for f in all_files 
-            if f.user_id == user.id and 
-               f.meta and 
-               f.meta.get("data", {}).get("source") == "google_drive"
-        ]
-        
-        log.info(f"[SYNC] Found {len(user_drive_files)} Google Drive files for user {user.id}")
+        counts = Counter()
+        after_id = None
+        while True:
+            user_drive_files = Files.get_files_by_user_id_and_source(
+                user.id,
+                "google_drive",
+                after_id=after_id,
+                limit=GOOGLE_DRIVE_SYNC_BATCH_SIZE,
+            )
+            if not user_drive_files:
+                break
+
+            counts.update(
+                await asyncio.gather(*[sync_one(file) for file in user_drive_files])
+            )
+            after_id = user_drive_files[-1].id
+
+        log.info(f"[SYNC] Found {counts.total()} Google Drive files for user {user.id}")
         
-        if not user_drive_files:
+        if not counts:
             return {
                 "message": "No Google Drive files found",
                 "synced": 0,
@@ -223,19 +293,9 @@ async def sync_all_google_drive_files(
                 "failed": 0
             }
         
-        synced = 0
-        updated = 0
-        failed = 0
-        
-        for file in user_drive_files:
-            try:
-                result = await sync_drive_file(file, access_token, request=request, user=user)
-                if result.get("updated"):
-                    updated += 1
-                synced += 1
-            except Exception as e:
-                log.error(f"Failed to sync file {file.id}: {e}")
-                failed += 1
+        updated = counts["updated"]
+        failed = counts["failed"]
+        synced = updated + counts["unchanged"]
         
         return {
             "message": f"Sync complete: {updated} updated, {synced - updated} unchanged, {failed} failed",
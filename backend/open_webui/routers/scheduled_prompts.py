@@ -1,5 +1,9 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import asyncio
+import time
+from typing import Iterator, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from open_webui.models.scheduled_prompts import (
     ScheduledPromptForm,
@@ -11,7 +15,12 @@ from open_webui.models.scheduled_prompts import (
 from open_webui.models.models import Models
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_admin_user, get_verified_user
-from open_webui.utils.scheduler import calculate_next_run, validate_cron_expression
+from open_webui.utils.misc import is_not_modified
+from open_webui.utils.scheduler import (
+    calculate_next_run,
+    execute_scheduled_prompt,
+    validate_cron_expression,
+)
 
 import logging
 
@@ -22,6 +31,85 @@ router = APIRouter()
 # Rate limit: max scheduled prompts per user
 MAX_SCHEDULED_PROMPTS_PER_USER = 50
 
+# The stored models carry more than the response exposes (e.g. the owner)
+SCHEDULED_PROMPT_RESPONSE_FIELDS = set(ScheduledPromptResponse.model_fields)
+
+
+def serialize_scheduled_prompt(prompt: ScheduledPromptModel) -> dict:
+    """
+    ScheduledPromptResponse fields of a prompt as a plain dict. Returned through
+    ORJSONResponse, which skips FastAPI's response_model validation and
+    jsonable_encoder pass; the decorators keep response_model for the docs.
+    """
+    return prompt.model_dump(include=SCHEDULED_PROMPT_RESPONSE_FIELDS)
+
+
+def stream_all_scheduled_prompts() -> Iterator[bytes]:
+    """All prompts as a JSON array, encoded row by row as they are read"""
+    yield b"["
+    for i, prompt in enumerate(ScheduledPrompts.iter_scheduled_prompts()):
+        body = orjson.dumps(serialize_scheduled_prompt(prompt))
+        yield b"," + body if i else body
+    yield b"]"
+
+
+def get_scheduled_prompt_list_response(
+    request: Request, user_id: Optional[str], summary: bool
+) -> Response:
+    """
+    The prompt list (all prompts if user_id is None) behind a weak ETag built
+    from the list's count and latest updated_at, so a client polling an
+    unchanged list gets a 304 without the rows being loaded
+    """
+    count, latest_updated_at = ScheduledPrompts.get_scheduled_prompt_list_version(
+        user_id
+    )
+    headers = {"Cache-Control": "private, must-revalidate"}
+
+    # updated_at is in whole seconds, so a second write within the same second
+    # as the newest one would leave (count, latest updated_at) unchanged. Only
+    # tag a list once its newest write is older than that: every later insert
+    # or update then raises the latest updated_at, and deletes lower the count
+    if latest_updated_at is None or latest_updated_at < int(time.time()) - 1:
+        etag = f'W/"{user_id or "all"}-{"summary" if summary else "full"}-{count}-{latest_updated_at}"'
+        headers["ETag"] = etag
+
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+
+    if summary:
+        content = ScheduledPrompts.get_scheduled_prompt_summaries(user_id)
+    elif user_id is None:
+        # Every user's prompts can be thousands of rows on a busy instance;
+        # stream them instead of building the whole list first
+        return StreamingResponse(
+            stream_all_scheduled_prompts(),
+            media_type="application/json",
+            headers=headers,
+        )
+    else:
+        prompts = ScheduledPrompts.get_scheduled_prompts_by_user_id(user_id)
+        content = [serialize_scheduled_prompt(prompt) for prompt in prompts]
+
+    return ORJSONResponse(content, headers=headers)
+
+
+def raise_scheduled_prompt_not_accessible(id: str):
+    """
+    Raise for a prompt a *_for_user method did not match: 404 if it does not
+    exist, 403 otherwise (owners and admins would have matched)
+    """
+    if not ScheduledPrompts.get_scheduled_prompt_by_id(id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+    )
+
 
 ############################
 # GetScheduledPrompts
@@ -29,42 +117,17 @@ MAX_SCHEDULED_PROMPTS_PER_USER = 50
 
 
 @router.get("/", response_model=list[ScheduledPromptResponse])
-async def get_scheduled_prompts(user=Depends(get_verified_user)):
+async def get_scheduled_prompts(
+    request: Request, summary: bool = False, user=Depends(get_verified_user)
+):
     """
     Get all scheduled prompts for the current user.
     Admins can see all scheduled prompts.
+    With summary, returns ScheduledPromptSummaryResponse items (no prompt texts).
     """
-    if user.role == "admin":
-        prompts = ScheduledPrompts.get_scheduled_prompts()
-    else:
-        prompts = ScheduledPrompts.get_scheduled_prompts_by_user_id(user.id)
-    
-    return [
-        ScheduledPromptResponse(
-            id=prompt.id,
-            user_id=prompt.user_id,
-            name=prompt.name,
-            cron_expression=prompt.cron_expression,
-            timezone=prompt.timezone,
-            enabled=prompt.enabled,
-            model_id=prompt.model_id,
-            system_prompt=prompt.system_prompt,
-            prompt=prompt.prompt,
-            chat_id=prompt.chat_id,
-            create_new_chat=prompt.create_new_chat,
-            run_once=prompt.run_once,
-            tool_ids=prompt.tool_ids,
-            function_calling_mode=prompt.function_calling_mode,
-            last_run_at=prompt.last_run_at,
-            next_run_at=prompt.next_run_at,
-            last_status=prompt.last_status,
-            last_error=prompt.last_error,
-            run_count=prompt.run_count,
-            created_at=prompt.created_at,
-            updated_at=prompt.updated_at,
-        )
-        for prompt in prompts
-    ]
+    return get_scheduled_prompt_list_response(
+        request, None if user.role == "admin" else user.id, summary
+    )
 
 
 ############################
@@ -79,14 +142,6 @@ async def create_scheduled_prompt(
     """
     Create a new scheduled prompt
     """
-    # Rate limiting: check user's prompt count
-    current_count = ScheduledPrompts.count_scheduled_prompts_by_user_id(user.id)
-    if current_count >= MAX_SCHEDULED_PROMPTS_PER_USER:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Maximum number of scheduled prompts ({MAX_SCHEDULED_PROMPTS_PER_USER}) reached",
-        )
-
     # Validate cron expression
     if not validate_cron_expression(form_data.cron_expression):
         raise HTTPException(
@@ -95,8 +150,7 @@ async def create_scheduled_prompt(
         )
 
     # Validate model exists
-    model = Models.get_model_by_id(form_data.model_id)
-    if not model:
+    if not await asyncio.to_thread(Models.model_exists, form_data.model_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Model '{form_data.model_id}' not found",
@@ -105,40 +159,11 @@ async def create_scheduled_prompt(
     try:
         # Calculate next run time
         next_run_at = calculate_next_run(form_data.cron_expression, form_data.timezone)
-        
-        prompt = ScheduledPrompts.insert_new_scheduled_prompt(
-            user.id, form_data, next_run_at=next_run_at
-        )
 
-        if prompt:
-            return ScheduledPromptResponse(
-                id=prompt.id,
-                user_id=prompt.user_id,
-                name=prompt.name,
-                cron_expression=prompt.cron_expression,
-                timezone=prompt.timezone,
-                enabled=prompt.enabled,
-                model_id=prompt.model_id,
-                system_prompt=prompt.system_prompt,
-                prompt=prompt.prompt,
-                chat_id=prompt.chat_id,
-                create_new_chat=prompt.create_new_chat,
-                run_once=prompt.run_once,
-                tool_ids=prompt.tool_ids,
-                function_calling_mode=prompt.function_calling_mode,
-                last_run_at=prompt.last_run_at,
-                next_run_at=prompt.next_run_at,
-                last_status=prompt.last_status,
-                last_error=prompt.last_error,
-                run_count=prompt.run_count,
-                created_at=prompt.created_at,
-                updated_at=prompt.updated_at,
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ERROR_MESSAGES.DEFAULT(),
-            )
+        # Rate limiting: the user's prompt count is checked by the insert itself
+        prompt = ScheduledPrompts.insert_new_scheduled_prompt_within_limit(
+            user.id, form_data, MAX_SCHEDULED_PROMPTS_PER_USER, next_run_at=next_run_at
+        )
     except Exception as e:
         log.error(f"Error creating scheduled prompt: {e}")
         raise HTTPException(
@@ -146,6 +171,14 @@ async def create_scheduled_prompt(
             detail=str(e),
         )
 
+    if not prompt:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Maximum number of scheduled prompts ({MAX_SCHEDULED_PROMPTS_PER_USER}) reached",
+        )
+
+    return ORJSONResponse(serialize_scheduled_prompt(prompt))
+
 
 ############################
 # GetScheduledPromptById
@@ -172,29 +205,7 @@ async def get_scheduled_prompt_by_id(id: str, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    return ScheduledPromptResponse(
-        id=prompt.id,
-        user_id=prompt.user_id,
-        name=prompt.name,
-        cron_expression=prompt.cron_expression,
-        timezone=prompt.timezone,
-        enabled=prompt.enabled,
-        model_id=prompt.model_id,
-        system_prompt=prompt.system_prompt,
-        prompt=prompt.prompt,
-        chat_id=prompt.chat_id,
-        create_new_chat=prompt.create_new_chat,
-        run_once=prompt.run_once,
-        tool_ids=prompt.tool_ids,
-        function_calling_mode=prompt.function_calling_mode,
-        last_run_at=prompt.last_run_at,
-        next_run_at=prompt.next_run_at,
-        last_status=prompt.last_status,
-        last_error=prompt.last_error,
-        run_count=prompt.run_count,
-        created_at=prompt.created_at,
-        updated_at=prompt.updated_at,
-    )
+    return ORJSONResponse(serialize_scheduled_prompt(prompt))
 
 
 ############################
@@ -211,21 +222,6 @@ async def update_scheduled_prompt_by_id(
     """
     Update a scheduled prompt by ID
     """
-    prompt = ScheduledPrompts.get_scheduled_prompt_by_id(id)
-    
-    if not prompt:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
-
-    # Check ownership (admins can update any)
-    if prompt.user_id != user.id and user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
-
     # Validate cron expression if being updated
     if form_data.cron_expression is not None:
         if not validate_cron_expression(form_data.cron_expression):
@@ -236,52 +232,22 @@ async def update_scheduled_prompt_by_id(
 
     # Validate model if being updated
     if form_data.model_id is not None:
-        model = Models.get_model_by_id(form_data.model_id)
-        if not model:
+        if not await asyncio.to_thread(Models.model_exists, form_data.model_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Model '{form_data.model_id}' not found",
             )
 
-    # Recalculate next run time if cron or timezone changed
-    next_run_at = None
-    cron = form_data.cron_expression if form_data.cron_expression else prompt.cron_expression
-    tz = form_data.timezone if form_data.timezone else prompt.timezone
-    
-    if form_data.cron_expression is not None or form_data.timezone is not None:
-        next_run_at = calculate_next_run(cron, tz)
+    # Ownership is part of the update's lookup, so owners and admins need no
+    # separate read; the next run is recalculated there if the schedule changed
+    updated_prompt = ScheduledPrompts.update_scheduled_prompt_by_id_for_user(
+        id, user.id, user.is_admin, form_data, calculate_next_run
+    )
 
-    updated_prompt = ScheduledPrompts.update_scheduled_prompt_by_id(id, form_data, next_run_at)
-    
-    if updated_prompt:
-        return ScheduledPromptResponse(
-            id=updated_prompt.id,
-            user_id=updated_prompt.user_id,
-            name=updated_prompt.name,
-            cron_expression=updated_prompt.cron_expression,
-            timezone=updated_prompt.timezone,
-            enabled=updated_prompt.enabled,
-            model_id=updated_prompt.model_id,
-            system_prompt=updated_prompt.system_prompt,
-            prompt=updated_prompt.prompt,
-            chat_id=updated_prompt.chat_id,
-            create_new_chat=updated_prompt.create_new_chat,
-            run_once=updated_prompt.run_once,
-            tool_ids=updated_prompt.tool_ids,
-            function_calling_mode=updated_prompt.function_calling_mode,
-            last_run_at=updated_prompt.last_run_at,
-            next_run_at=updated_prompt.next_run_at,
-            last_status=updated_prompt.last_status,
-            last_error=updated_prompt.last_error,
-            run_count=updated_prompt.run_count,
-            created_at=updated_prompt.created_at,
-            updated_at=updated_prompt.updated_at,
-        )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ERROR_MESSAGES.DEFAULT(),
-        )
+    if not updated_prompt:
+        raise_scheduled_prompt_not_accessible(id)
+
+    return ORJSONResponse(serialize_scheduled_prompt(updated_prompt))
 
 
 ############################
@@ -294,60 +260,16 @@ async def toggle_scheduled_prompt(id: str, user=Depends(get_verified_user)):
     """
     Toggle enabled/disabled state of a scheduled prompt
     """
-    prompt = ScheduledPrompts.get_scheduled_prompt_by_id(id)
-    
-    if not prompt:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=ERROR_MESSAGES.NOT_FOUND,
-        )
-
-    # Check ownership
-    if prompt.user_id != user.id and user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
-        )
+    # Toggle and recalculate next run if enabling, in the same session that
+    # finds the prompt
+    updated_prompt = ScheduledPrompts.toggle_scheduled_prompt_by_id_for_user(
+        id, user.id, user.is_admin, calculate_next_run
+    )
 
-    # Toggle and recalculate next run if enabling
-    new_enabled = not prompt.enabled
-    next_run_at = None
-    
-    if new_enabled:
-        next_run_at = calculate_next_run(prompt.cron_expression, prompt.timezone)
+    if not updated_prompt:
+        raise_scheduled_prompt_not_accessible(id)
 
-    form_data = ScheduledPromptUpdateForm(enabled=new_enabled)
-    updated_prompt = ScheduledPrompts.update_scheduled_prompt_by_id(id, form_data, next_run_at)
-    
-    if updated_prompt:
-        return ScheduledPromptResponse(
-            id=updated_prompt.id,
-            user_id=updated_prompt.user_id,
-            name=updated_prompt.name,
-            cron_expression=updated_prompt.cron_expression,
-            timezone=updated_prompt.timezone,
-            enabled=updated_prompt.enabled,
-            model_id=updated_prompt.model_id,
-            system_prompt=updated_prompt.system_prompt,
-            prompt=updated_prompt.prompt,
-            chat_id=updated_prompt.chat_id,
-            create_new_chat=updated_prompt.create_new_chat,
-            run_once=updated_prompt.run_once,
-            tool_ids=updated_prompt.tool_ids,
-            function_calling_mode=updated_prompt.function_calling_mode,
-            last_run_at=updated_prompt.last_run_at,
-            next_run_at=updated_prompt.next_run_at,
-            last_status=updated_prompt.last_status,
-            last_error=updated_prompt.last_error,
-            run_count=updated_prompt.run_count,
-            created_at=updated_prompt.created_at,
-            updated_at=updated_prompt.updated_at,
-        )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ERROR_MESSAGES.DEFAULT(),
-        )
+    return ORJSONResponse(serialize_scheduled_prompt(updated_prompt))
 
 
 ############################
@@ -377,9 +299,6 @@ async def run_scheduled_prompt_now(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    # Import here to avoid circular imports
-    from open_webui.utils.scheduler import execute_scheduled_prompt
-    
     try:
         result = await execute_scheduled_prompt(request.app, prompt)
         return {
@@ -430,35 +349,11 @@ async def delete_scheduled_prompt_by_id(id: str, user=Depends(get_verified_user)
 
 
 @router.get("/admin/all", response_model=list[ScheduledPromptResponse])
-async def get_all_scheduled_prompts(user=Depends(get_admin_user)):
+async def get_all_scheduled_prompts(
+    request: Request, summary: bool = False, user=Depends(get_admin_user)
+):
     """
     Admin endpoint: Get all scheduled prompts from all users
+    With summary, returns ScheduledPromptSummaryResponse items (no prompt texts).
     """
-    prompts = ScheduledPrompts.get_scheduled_prompts()
-    
-    return [
-        ScheduledPromptResponse(
-            id=prompt.id,
-            user_id=prompt.user_id,
-            name=prompt.name,
-            cron_expression=prompt.cron_expression,
-            timezone=prompt.timezone,
-            enabled=prompt.enabled,
-            model_id=prompt.model_id,
-            system_prompt=prompt.system_prompt,
-            prompt=prompt.prompt,
-            chat_id=prompt.chat_id,
-            create_new_chat=prompt.create_new_chat,
-            run_once=prompt.run_once,
-            tool_ids=prompt.tool_ids,
-            function_calling_mode=prompt.function_calling_mode,
-            last_run_at=prompt.last_run_at,
-            next_run_at=prompt.next_run_at,
-            last_status=prompt.last_status,
-            last_error=prompt.last_error,
-            run_count=prompt.run_count,
-            created_at=prompt.created_at,
-            updated_at=prompt.updated_at,
-        )
-        for prompt in prompts
-    ]
+    return get_scheduled_prompt_list_response(request, None, summary)
@@ -214,6 +214,11 @@ def get_active_user_ids():
     return list(USER_POOL.keys())
 
 
+def get_active_user_count():
+    """Get the number of active users without materializing their IDs."""
+    return len(USER_POOL)
+
+
 def get_user_active_status(user_id):
     """Check if a user is currently active."""
     return user_id in USER_POOL
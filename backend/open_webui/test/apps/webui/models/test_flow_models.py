@@ -0,0 +1,213 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from open_webui.models.flows import (
+    FLOW_CACHE_MAX_SIZE,
+    FLOW_CACHE_TTL,
+    Flow,
+    FlowCache,
+    FlowForm,
+    Flows,
+)
+
+
+@pytest.fixture
+def flow_db(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Flow.__table__.create(engine)
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    )
+
+    @contextmanager
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr("open_webui.models.flows.get_db", get_db)
+    monkeypatch.setattr(
+        "open_webui.models.flows._flow_cache",
+        FlowCache(FLOW_CACHE_TTL, FLOW_CACHE_MAX_SIZE),
+    )
+    monkeypatch.setattr(
+        "open_webui.models.flows.Groups.get_groups_by_member_id",
+        lambda user_id: [],
+    )
+    return session_factory
+
+
+def _insert_flow(user_id, name, access_control=None):
+    return Flows.insert_new_flow(
+        user_id,
+        FlowForm(name=name, nodes=[], edges=[], access_control=access_control),
+    )
+
+
+def test_flow_list_does_not_fetch_other_users_private_flows(flow_db, monkeypatch):
+    own = _insert_flow("u1", "own")
+    _insert_flow("u2", "private")
+
+    checked = []
+
+    def _has_access(user_id, permission, access_control, user_group_ids):
+        checked.append(access_control)
+        return False
+
+    monkeypatch.setattr("open_webui.models.flows.has_access", _has_access)
+
+    flows = Flows.get_flow_list_by_user_id("u1", permission="write")
+
+    assert [flow["id"] for flow in flows] == [own.id]
+    # The private flow is excluded by the query, not by the per-row check
+    assert checked == []
+
+
+def test_flow_list_returns_flows_shared_for_write(flow_db):
+    shared = _insert_flow(
+        "u2", "shared", access_control={"write": {"user_ids": ["u1"]}}
+    )
+    _insert_flow("u2", "private")
+    _insert_flow("u2", "read only", access_control={"read": {"user_ids": ["u1"]}})
+
+    flows = Flows.get_flow_list_by_user_id("u1", permission="write")
+
+    assert [flow["id"] for flow in flows] == [shared.id]
+
+
+def test_flow_list_read_includes_other_users_public_flows(flow_db):
+    public = _insert_flow("u2", "public")
+
+    flows = Flows.get_flow_list_by_user_id("u1", permission="read", summary=True)
+
+    assert [flow["id"] for flow in flows] == [public.id]
+    assert "nodes" not in flows[0]
+
+
+def test_get_flow_by_id_reads_access_control_changed_elsewhere(flow_db):
+    flow = _insert_flow("u1", "flow")
+    assert Flows.get_flow_by_id(flow.id).access_control is None
+
+    # Another worker shares the flow within the same second: this process's
+    # cache is not invalidated and updated_at is unchanged
+    access_control = {"read": {"user_ids": ["u2"]}}
+    with flow_db() as db:
+        db.query(Flow).filter(Flow.id == flow.id).update(
+            {"access_control": access_control}
+        )
+        db.commit()
+
+    assert Flows.get_flow_by_id(flow.id).access_control == access_control
+
+
+def test_get_flow_by_id_misses_flow_deleted_elsewhere(flow_db):
+    flow = _insert_flow("u1", "flow")
+    assert Flows.get_flow_by_id(flow.id) is not None
+
+    with flow_db() as db:
+        db.query(Flow).filter(Flow.id == flow.id).delete()
+        db.commit()
+
+    assert Flows.get_flow_by_id(flow.id) is None
+
+
+def test_get_flow_by_id_reloads_content_updated_elsewhere(flow_db):
+    flow = _insert_flow("u1", "flow")
+
+    with flow_db() as db:
+        db.query(Flow).filter(Flow.id == flow.id).update(
+            {"name": "renamed", "updated_at": flow.updated_at + 1}
+        )
+        db.commit()
+
+    assert Flows.get_flow_by_id(flow.id).name == "renamed"
+
+
+def test_flow_cache_expires_entries_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("open_webui.models.flows.time.monotonic", lambda: now[0])
+    cache = FlowCache(ttl=30, max_size=16)
+
+    cache.set("a", "flow-a")
+    now[0] += 29
+    assert cache.get("a") == "flow-a"
+
+    now[0] += 1
+    assert cache.get("a") is None
+
+
+def test_flow_cache_bounds_its_size():
+    cache = FlowCache(ttl=30, max_size=8, segments=2)
+
+    for index in range(100):
+        cache.set(str(index), index)
+
+    assert sum(len(segment) for segment in cache._segments) <= 8
+    # The newest entries are the ones kept
+    assert cache.get("99") == 99
+
+
+def test_flow_cache_evicts_oldest_entry_in_a_full_segment():
+    cache = FlowCache(ttl=30, max_size=2, segments=1)
+
+    cache.set("a", "flow-a")
+    cache.set("b", "flow-b")
+    cache.set("c", "flow-c")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "flow-b"
+    assert cache.get("c") == "flow-c"
+
+
+def test_flow_cache_pop_during_segment_swap():
+    cache = FlowCache(ttl=30, max_size=2, segments=1)
+    cache.set("a", "flow-a")
+    cache.set("b", "flow-b")
+    snapshot = cache._segments[0]
+
+    # Invalidate, then fill the segment so the next write evicts and swaps it
+    cache.pop("a")
+    cache.set("c", "flow-c")
+    cache.set("d", "flow-d")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == "flow-c"
+    assert cache.get("d") == "flow-d"
+    # A reader holding the previous snapshot never sees it change
+    assert set(snapshot) == {"a", "b"}
+
+
+def test_flow_cache_pop_is_not_lost_to_concurrent_writes():
+    import threading
+
+    cache = FlowCache(ttl=30, max_size=1024, segments=1)
+    cache.set("target", "flow")
+    start = threading.Event()
+
+    def write(prefix):
+        start.wait()
+        for index in range(500):
+            cache.set(f"{prefix}-{index}", index)
+
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for writer in writers:
+        writer.start()
+    start.set()
+    cache.pop("target")
+    for writer in writers:
+        writer.join()
+
+    # Every write copies the latest segment under the lock, so a concurrent
+    # copy can't bring back the invalidated entry
+    assert cache.get("target") is None
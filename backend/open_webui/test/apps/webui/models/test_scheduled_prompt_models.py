@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from open_webui.models.scheduled_prompts import (
+    ScheduledPrompt,
+    ScheduledPromptForm,
+    ScheduledPrompts,
+)
+
+
+@pytest.fixture
+def scheduled_prompt_db(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    ScheduledPrompt.__table__.create(engine)
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    )
+
+    @contextmanager
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr("open_webui.models.scheduled_prompts.get_db", get_db)
+    monkeypatch.setattr(
+        "open_webui.models.scheduled_prompts._scheduled_prompt_cache", {}
+    )
+    return session_factory
+
+
+def _form(name):
+    return ScheduledPromptForm(
+        name=name,
+        cron_expression="0 9 * * *",
+        model_id="model-1",
+        prompt="Summarize the news",
+    )
+
+
+def _count(session_factory, user_id):
+    with session_factory() as db:
+        return db.query(ScheduledPrompt).filter_by(user_id=user_id).count()
+
+
+def test_insert_within_limit_allows_up_to_the_limit(scheduled_prompt_db):
+    limit = 3
+
+    # Below the limit (0, 1 and limit - 1 existing prompts) every insert succeeds
+    for index in range(limit):
+        prompt = ScheduledPrompts.insert_new_scheduled_prompt_within_limit(
+            "u1", _form(f"prompt {index}"), limit, next_run_at=1000
+        )
+        assert prompt is not None
+        assert prompt.user_id == "u1"
+        assert prompt.name == f"prompt {index}"
+        assert prompt.next_run_at == 1000
+
+    assert _count(scheduled_prompt_db, "u1") == limit
+
+
+def test_insert_within_limit_returns_none_at_the_limit(scheduled_prompt_db):
+    limit = 2
+    for index in range(limit):
+        assert ScheduledPrompts.insert_new_scheduled_prompt_within_limit(
+            "u1", _form(f"prompt {index}"), limit
+        )
+
+    # At the limit, and on every further attempt, nothing is inserted
+    for _ in range(2):
+        assert (
+            ScheduledPrompts.insert_new_scheduled_prompt_within_limit(
+                "u1", _form("one too many"), limit
+            )
+            is None
+        )
+
+    assert _count(scheduled_prompt_db, "u1") == limit
+
+
+def test_insert_within_limit_returns_none_over_the_limit(scheduled_prompt_db):
+    # Already over a (since lowered) limit
+    for index in range(3):
+        ScheduledPrompts.insert_new_scheduled_prompt("u1", _form(f"prompt {index}"))
+
+    assert (
+        ScheduledPrompts.insert_new_scheduled_prompt_within_limit(
+            "u1", _form("one too many"), 2
+        )
+        is None
+    )
+    assert _count(scheduled_prompt_db, "u1") == 3
+
+
+def test_insert_within_limit_counts_per_user(scheduled_prompt_db):
+    assert ScheduledPrompts.insert_new_scheduled_prompt_within_limit(
+        "u1", _form("u1 prompt"), 1
+    )
+
+    assert ScheduledPrompts.insert_new_scheduled_prompt_within_limit(
+        "u2", _form("u2 prompt"), 1
+    )
+    assert _count(scheduled_prompt_db, "u2") == 1
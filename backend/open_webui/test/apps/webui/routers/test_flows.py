@@ -0,0 +1,172 @@
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from open_webui.models.flow_executions import FlowExecutionForm, FlowExecutions
+from open_webui.models.flows import FLOW_CACHE_MAX_SIZE, FLOW_CACHE_TTL, Flow, FlowCache
+from open_webui.routers import flows
+from open_webui.utils.auth import get_verified_user
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Flow.__table__.create(engine)
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    )
+
+    @contextmanager
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr("open_webui.models.flows.get_db", get_db)
+    monkeypatch.setattr(
+        "open_webui.models.flows._flow_cache",
+        FlowCache(FLOW_CACHE_TTL, FLOW_CACHE_MAX_SIZE),
+    )
+
+    app = FastAPI()
+    app.include_router(flows.router, prefix="/api/v1/flows")
+    app.dependency_overrides[get_verified_user] = lambda: SimpleNamespace(
+        id="u1", role="user", is_admin=False
+    )
+    return TestClient(app)
+
+
+def _execution_form(flow_id="flow-1"):
+    return FlowExecutionForm(flow_id=flow_id, status="success", execution_time=5)
+
+
+def test_create_flow_execution_queues_the_execution(monkeypatch):
+    queued = []
+
+    def _enqueue(execution):
+        queued.append(execution)
+        return True
+
+    monkeypatch.setattr(flows, "enqueue_flow_execution", _enqueue)
+
+    response = asyncio.run(
+        flows.create_flow_execution(
+            _execution_form(),
+            flow=SimpleNamespace(id="flow-1"),
+            user=SimpleNamespace(id="u1"),
+        )
+    )
+
+    assert response.status_code == 202
+    assert orjson.loads(response.body)["id"] == queued[0].id
+
+
+def test_create_flow_execution_saves_the_built_execution_when_queue_is_full(
+    monkeypatch,
+):
+    inserted = []
+
+    monkeypatch.setattr(flows, "enqueue_flow_execution", lambda execution: False)
+    monkeypatch.setattr(
+        FlowExecutions, "insert_executions", lambda executions: inserted.extend(executions)
+    )
+
+    response = asyncio.run(
+        flows.create_flow_execution(
+            _execution_form(),
+            flow=SimpleNamespace(id="flow-1"),
+            user=SimpleNamespace(id="u1"),
+        )
+    )
+
+    assert response.status_code == 200
+    body = orjson.loads(response.body)
+    # The saved record is the one returned, not a second one with a new id
+    assert len(inserted) == 1
+    assert body["id"] == inserted[0].id
+    assert body["created_at"] == inserted[0].created_at
+
+
+@pytest.mark.parametrize("path", ["", "/export"])
+def test_get_flow_answers_unchanged_flow_with_304(client, path):
+    response = client.post(
+        "/api/v1/flows/create", json={"name": "Flow", "nodes": [], "edges": []}
+    )
+    flow_id = response.json()["id"]
+
+    response = client.get(f"/api/v1/flows/{flow_id}{path}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        f"/api/v1/flows/{flow_id}{path}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("path", ["", "/export"])
+def test_get_flow_etag_changes_when_flow_is_updated(client, path):
+    response = client.post(
+        "/api/v1/flows/create", json={"name": "Flow", "nodes": [], "edges": []}
+    )
+    flow_id = response.json()["id"]
+    etag = client.get(f"/api/v1/flows/{flow_id}{path}").headers["ETag"]
+
+    # Usually saved within the same second as the create, with the same updated_at
+    response = client.post(f"/api/v1/flows/{flow_id}", json={"name": "Renamed"})
+    assert response.status_code == 200
+
+    response = client.get(
+        f"/api/v1/flows/{flow_id}{path}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_execute_flow_checks_the_flow(client):
+    response = client.post("/api/v1/flows/missing/execute", json={})
+    assert response.status_code == 404
+
+    response = client.post(
+        "/api/v1/flows/create", json={"name": "Flow", "nodes": [], "edges": []}
+    )
+    flow_id = response.json()["id"]
+
+    response = client.post(f"/api/v1/flows/{flow_id}/execute", json={})
+    assert response.status_code == 200
+    assert response.json()["flowId"] == flow_id
+
+
+def test_execute_flow_rejects_unreadable_flow(client):
+    response = client.post(
+        "/api/v1/flows/create", json={"name": "Flow", "nodes": [], "edges": []}
+    )
+    flow_id = response.json()["id"]
+
+    client.app.dependency_overrides[get_verified_user] = lambda: SimpleNamespace(
+        id="u2", role="user", is_admin=False
+    )
+    # A flow without access_control is readable by others, so share it for
+    # writing only to make it unreadable
+    flows.Flows.update_flow_by_id(
+        flow_id, flows.FlowUpdateForm(access_control={"write": {}})
+    )
+
+    response = client.post(f"/api/v1/flows/{flow_id}/execute", json={})
+    assert response.status_code == 403
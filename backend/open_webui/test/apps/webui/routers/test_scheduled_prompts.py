@@ -0,0 +1,143 @@
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from open_webui.models.scheduled_prompts import (
+    ScheduledPrompt,
+    ScheduledPromptForm,
+    ScheduledPrompts,
+)
+from open_webui.routers import scheduled_prompts
+from open_webui.utils.auth import get_verified_user
+
+BASE_URL = "/api/v1/scheduled_prompts/"
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    ScheduledPrompt.__table__.create(engine)
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    )
+
+    @contextmanager
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr("open_webui.models.scheduled_prompts.get_db", get_db)
+    monkeypatch.setattr(
+        "open_webui.models.scheduled_prompts._scheduled_prompt_cache", {}
+    )
+    # Lists written to in the last second are not tagged; run the router a
+    # little in the future so freshly written lists are
+    monkeypatch.setattr(
+        scheduled_prompts, "time", SimpleNamespace(time=lambda: time.time() + 10)
+    )
+    return session_factory
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(scheduled_prompts.router, prefix="/api/v1/scheduled_prompts")
+    app.dependency_overrides[get_verified_user] = lambda: SimpleNamespace(
+        id="u1", role="user", is_admin=False
+    )
+    return TestClient(app)
+
+
+def _insert_prompt(session_factory, name="Daily news", updated_at=1000):
+    prompt = ScheduledPrompts.insert_new_scheduled_prompt(
+        "u1",
+        ScheduledPromptForm(
+            name=name,
+            cron_expression="0 9 * * *",
+            model_id="model-1",
+            prompt="Summarize the news",
+        ),
+    )
+    # Backdate it, so any later write raises the list's latest updated_at
+    with session_factory() as db:
+        db.query(ScheduledPrompt).filter_by(id=prompt.id).update(
+            {"updated_at": updated_at}
+        )
+        db.commit()
+    return prompt
+
+
+@pytest.mark.parametrize("summary", [False, True])
+def test_scheduled_prompt_list_answers_unchanged_list_with_304(
+    session_factory, client, summary
+):
+    _insert_prompt(session_factory)
+    params = {"summary": "true"} if summary else {}
+
+    response = client.get(BASE_URL, params=params)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    etag = response.headers["ETag"]
+    assert etag.startswith("W/")
+
+    response = client.get(BASE_URL, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_scheduled_prompt_list_etag_changes_on_update(session_factory, client):
+    prompt = _insert_prompt(session_factory)
+    etag = client.get(BASE_URL).headers["ETag"]
+
+    response = client.post(f"{BASE_URL}{prompt.id}", json={"name": "Renamed"})
+    assert response.status_code == 200
+
+    response = client.get(BASE_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["name"] == "Renamed"
+
+
+def test_scheduled_prompt_list_etag_changes_on_status_update(session_factory, client):
+    prompt = _insert_prompt(session_factory)
+    etag = client.get(BASE_URL).headers["ETag"]
+
+    # A run recorded by the scheduler, not through the API
+    ScheduledPrompts.update_execution_status(prompt.id, "success")
+
+    response = client.get(BASE_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["last_status"] == "success"
+
+
+def test_scheduled_prompt_list_etag_changes_on_create_and_delete(
+    session_factory, client
+):
+    prompt = _insert_prompt(session_factory)
+    etag = client.get(BASE_URL).headers["ETag"]
+
+    _insert_prompt(session_factory, name="Weekly report", updated_at=900)
+    response = client.get(BASE_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    assert client.delete(f"{BASE_URL}{prompt.id}").status_code == 200
+    response = client.get(BASE_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
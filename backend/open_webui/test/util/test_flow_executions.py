@@ -0,0 +1,112 @@
+import asyncio
+
+from sqlalchemy.exc import IntegrityError
+
+from open_webui.models.flow_executions import FlowExecutionForm, FlowExecutions
+from open_webui.utils import flow_executions
+from open_webui.utils.flow_executions import (
+    enqueue_flow_execution,
+    start_flow_execution_writer,
+    stop_flow_execution_writer,
+)
+
+
+def _build_execution(flow_id="flow-1"):
+    return FlowExecutions.build_new_execution(
+        "u1",
+        FlowExecutionForm(flow_id=flow_id, status="success", execution_time=5),
+    )
+
+
+def _capture_inserts(monkeypatch, fail=None):
+    inserted = []
+
+    def _insert_executions(executions):
+        if fail:
+            fail(executions)
+        inserted.append([execution.id for execution in executions])
+
+    monkeypatch.setattr(FlowExecutions, "insert_executions", _insert_executions)
+    return inserted
+
+
+def test_enqueue_flow_execution_fails_without_running_writer(monkeypatch):
+    monkeypatch.setattr(flow_executions, "_queue", None)
+    monkeypatch.setattr(flow_executions, "_writer_task", None)
+
+    assert enqueue_flow_execution(_build_execution()) is False
+
+
+def test_flow_execution_writer_saves_queued_executions_in_one_batch(monkeypatch):
+    inserted = _capture_inserts(monkeypatch)
+    executions = [_build_execution() for _ in range(3)]
+
+    async def run():
+        start_flow_execution_writer()
+        for execution in executions:
+            assert enqueue_flow_execution(execution)
+        # Let the writer pick up the queue
+        await asyncio.sleep(0.1)
+        await stop_flow_execution_writer()
+
+    asyncio.run(run())
+
+    assert inserted == [[execution.id for execution in executions]]
+
+
+def test_stop_flow_execution_writer_flushes_the_queue(monkeypatch):
+    inserted = _capture_inserts(monkeypatch)
+    executions = [_build_execution() for _ in range(3)]
+
+    async def run():
+        start_flow_execution_writer()
+        for execution in executions:
+            assert enqueue_flow_execution(execution)
+        # Stopped before the writer got to run at all
+        await stop_flow_execution_writer()
+
+    asyncio.run(run())
+
+    assert [id for batch in inserted for id in batch] == [
+        execution.id for execution in executions
+    ]
+
+
+def test_stop_flow_execution_writer_flushes_a_batch_waiting_for_retry(monkeypatch):
+    attempts = []
+
+    def fail_first_attempt(executions):
+        attempts.append(len(executions))
+        if len(attempts) == 1:
+            raise ConnectionError("database unavailable")
+
+    inserted = _capture_inserts(monkeypatch, fail=fail_first_attempt)
+    monkeypatch.setattr(flow_executions, "FLOW_EXECUTION_RETRY_DELAY", 60)
+    execution = _build_execution()
+
+    async def run():
+        start_flow_execution_writer()
+        assert enqueue_flow_execution(execution)
+        # The writer fails once and is now sleeping before its retry
+        await asyncio.sleep(0.1)
+        await stop_flow_execution_writer()
+
+    asyncio.run(run())
+
+    assert inserted == [[execution.id]]
+    assert flow_executions._unwritten == []
+
+
+def test_flow_execution_writer_drops_only_rejected_rows(monkeypatch):
+    executions = [_build_execution() for _ in range(3)]
+    duplicate_id = executions[1].id
+
+    def reject_duplicate(batch):
+        if any(execution.id == duplicate_id for execution in batch):
+            raise IntegrityError("INSERT", {}, Exception("duplicate id"))
+
+    inserted = _capture_inserts(monkeypatch, fail=reject_duplicate)
+
+    asyncio.run(flow_executions._write_batch(executions))
+
+    assert inserted == [[executions[0].id], [executions[2].id]]
@@ -85,7 +85,7 @@ def test_send_ntfy_notification_sets_click_header_without_link_in_body(monkeypat
             captured["timeout"] = timeout
             return _DummyResponse(status=200)
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
 
     user = SimpleNamespace(
         id="u1",
@@ -167,7 +167,7 @@ def test_execute_scheduled_prompt_filters_prompt_scheduler_and_sets_default_func
             captured["payload"] = json
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -255,7 +255,7 @@ def test_execute_scheduled_prompt_uses_native_mode_when_requested(monkeypatch):
             captured["payload"] = json
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -337,7 +337,7 @@ def test_execute_scheduled_prompt_auto_mode_omits_function_calling_param(monkeyp
             captured["payload"] = json
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -434,7 +434,7 @@ def test_execute_scheduled_prompt_auto_mode_retries_with_default_when_no_final_t
             captured_payloads.append(json)
             return _ApiResponse(json)
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -490,6 +490,102 @@ def test_execute_scheduled_prompt_auto_mode_retries_with_default_when_no_final_t
     assert captured_payloads[1]["params"]["function_calling"] == "default"
 
 
+def test_execute_scheduled_prompt_auto_mode_remembers_default_fallback(monkeypatch):
+    captured_payloads = []
+
+    class _ApiResponse:
+        def __init__(self, payload):
+            self.status = 200
+            self._payload = payload
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def text(self):
+            return ""
+
+        async def json(self):
+            if "params" not in self._payload:
+                return {
+                    "choices": [
+                        {
+                            "message": {
+                                "content": "",
+                                "tool_calls": [{"id": "call_1", "type": "function"}],
+                            }
+                        }
+                    ]
+                }
+            return {"choices": [{"message": {"content": "Final todo summary"}}]}
+
+    class _DummySession:
+        def post(self, url, headers, json, timeout):
+            captured_payloads.append(json)
+            return _ApiResponse(json)
+
+    monkeypatch.setattr("open_webui.utils.scheduler._auto_mode_fallbacks", {})
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
+    monkeypatch.setattr(
+        "open_webui.utils.scheduler.Users.get_user_by_id",
+        lambda _user_id: SimpleNamespace(id="u1", settings=None),
+    )
+    monkeypatch.setattr(
+        "open_webui.utils.scheduler.ScheduledPrompts.update_execution_status",
+        lambda *args, **kwargs: None,
+    )
+    monkeypatch.setattr(
+        "open_webui.utils.scheduler.ScheduledPrompts.update_scheduled_prompt_by_id",
+        lambda *args, **kwargs: None,
+    )
+
+    async def _noop_async(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr("open_webui.utils.scheduler.send_user_notification", _noop_async)
+    monkeypatch.setattr("open_webui.utils.scheduler.send_ntfy_notification", _noop_async)
+    monkeypatch.setattr(
+        "open_webui.utils.scheduler.Chats.insert_new_chat",
+        lambda _user_id, chat_form: SimpleNamespace(id="chat-1"),
+    )
+
+    app = SimpleNamespace(
+        state=SimpleNamespace(
+            MODELS={"model-1": {"info": {"meta": {"toolIds": []}}}},
+            config=SimpleNamespace(WEBUI_URL=""),
+        )
+    )
+
+    prompt = SimpleNamespace(
+        id="p4b",
+        name="Auto retry reminder",
+        user_id="u1",
+        system_prompt="",
+        prompt="What's on my todo list?",
+        model_id="model-1",
+        tool_ids=["notes_manager"],
+        function_calling_mode="auto",
+        chat_id=None,
+        create_new_chat=True,
+        run_once=False,
+        cron_expression="* * * * *",
+        timezone="UTC",
+    )
+
+    asyncio.run(execute_scheduled_prompt(app, prompt))
+    assert len(captured_payloads) == 2
+
+    captured_payloads.clear()
+    result = asyncio.run(execute_scheduled_prompt(app, prompt))
+
+    assert result["success"] is True
+    assert len(captured_payloads) == 1
+    assert captured_payloads[0]["params"]["function_calling"] == "default"
+
+
 def test_execute_scheduled_prompt_continues_when_model_returns_raw_tool_json(monkeypatch):
     captured_payloads = []
 
@@ -538,7 +634,7 @@ def test_execute_scheduled_prompt_continues_when_model_returns_raw_tool_json(mon
             captured_payloads.append(json)
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -645,7 +741,7 @@ def test_execute_scheduled_prompt_forces_generic_continuation_after_malformed_to
             captured_payloads.append(json)
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -744,7 +840,7 @@ def test_execute_scheduled_prompt_attaches_note_content_and_preserves_citations(
             captured["payload"] = json
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -859,7 +955,7 @@ def test_execute_scheduled_prompt_uses_continuation_sources_for_note_attachment(
         def post(self, url, headers, json, timeout):
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -970,7 +1066,7 @@ def test_execute_scheduled_prompt_strips_malformed_tool_chatter_prefix(monkeypat
         def post(self, url, headers, json, timeout):
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -1102,7 +1198,7 @@ def test_execute_scheduled_prompt_forces_notes_get_note_after_list_only_sources(
             captured_payloads.append(json)
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -1236,7 +1332,7 @@ def test_execute_scheduled_prompt_retries_when_get_note_uses_title_instead_of_uu
             captured_payloads.append(json)
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
@@ -1359,7 +1455,7 @@ def test_execute_scheduled_prompt_note_manager_search_notes_triggers_followup(mo
             captured_payloads.append(json)
             return _ApiResponse()
 
-    monkeypatch.setattr("open_webui.utils.scheduler.aiohttp.ClientSession", _DummySession)
+    monkeypatch.setattr("open_webui.utils.scheduler.get_http_session", _DummySession)
     monkeypatch.setattr("open_webui.utils.scheduler.create_token", lambda **kwargs: "token")
     monkeypatch.setattr(
         "open_webui.utils.scheduler.Users.get_user_by_id",
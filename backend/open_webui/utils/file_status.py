@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+# file_id -> set of (event loop, queue) pairs waiting for status updates.
+# Updates are published from worker threads (background tasks, sync endpoints),
+# so the registry is lock-protected and queues are fed via call_soon_threadsafe.
+_SUBSCRIBERS: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_SUBSCRIBERS_LOCK = threading.Lock()
+
+
+def publish_file_status(file_id: str, data: dict) -> None:
+    """
+    Push a file's latest data (status, error, ...) to everyone waiting on it.
+    Only reaches subscribers in this process; safe to call from any thread.
+    """
+    with _SUBSCRIBERS_LOCK:
+        subscribers = list(_SUBSCRIBERS.get(file_id, ()))
+
+    for loop, queue in subscribers:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, data)
+        except RuntimeError:
+            # The subscriber's event loop has already been closed
+            log.debug(f"Dropping file status update for closed loop: {file_id}")
+
+
+@contextmanager
+def subscribe_file_status(file_id: str):
+    """
+    Register for status updates of a file, yielding an asyncio.Queue that
+    receives the file's data dict on every published update.
+    Must be entered from within a running event loop.
+    """
+    queue = asyncio.Queue()
+    subscriber = (asyncio.get_running_loop(), queue)
+
+    with _SUBSCRIBERS_LOCK:
+        _SUBSCRIBERS.setdefault(file_id, set()).add(subscriber)
+
+    try:
+        yield queue
+    finally:
+        with _SUBSCRIBERS_LOCK:
+            subscribers = _SUBSCRIBERS.get(file_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del _SUBSCRIBERS[file_id]
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.models.flow_executions import FlowExecutionModel, FlowExecutions
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+# Flow executions are saved by a background writer that commits them in
+# batches, so saving one does not wait on its own DB commit. Per process.
+FLOW_EXECUTION_QUEUE_SIZE = 10_000
+FLOW_EXECUTION_BATCH_SIZE = 100
+# Executions were already answered with 202, so a batch that fails on a
+# transient database error is retried (with backoff) rather than dropped
+FLOW_EXECUTION_RETRY_DELAY = 1
+FLOW_EXECUTION_MAX_RETRY_DELAY = 30
+# Attempts per batch when flushing at shutdown, where waiting forever isn't an option
+FLOW_EXECUTION_SHUTDOWN_ATTEMPTS = 3
+
+_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
+# Batch the writer was holding when it was cancelled, flushed on shutdown
+_unwritten: list[FlowExecutionModel] = []
+
+
+def enqueue_flow_execution(execution: FlowExecutionModel) -> bool:
+    """
+    Queue an execution for the background writer.
+    Returns False if the writer is not running or its queue is full, in which
+    case the caller should save the execution itself.
+    """
+    if _queue is None or _writer_task is None or _writer_task.done():
+        return False
+
+    try:
+        _queue.put_nowait(execution)
+        return True
+    except asyncio.QueueFull:
+        return False
+
+
+def _drain_batch(batch: list[FlowExecutionModel]) -> None:
+    while len(batch) < FLOW_EXECUTION_BATCH_SIZE:
+        try:
+            batch.append(_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+
+
+async def _write_rows(
+    rows: list[FlowExecutionModel],
+) -> list[FlowExecutionModel]:
+    """
+    Save rows one by one, so a row the database rejects (a duplicate id, e.g.
+    one already saved before the writer was cancelled) only loses itself.
+    Returns the rows left unsaved by a transient error, to be retried.
+    """
+    for index, row in enumerate(rows):
+        try:
+            await asyncio.to_thread(FlowExecutions.insert_executions, [row])
+        except IntegrityError as e:
+            log.error(f"Dropping flow execution {row.id} of flow {row.flow_id}: {e}")
+        except Exception as e:
+            log.warning(f"Failed to save flow execution {row.id}: {e}")
+            return rows[index:]
+    return []
+
+
+async def _write_batch(
+    batch: list[FlowExecutionModel], max_attempts: Optional[int] = None
+) -> None:
+    """
+    Save a batch in one commit; if the database rejects it, fall back to
+    saving its rows one by one. Transient failures are retried with backoff,
+    indefinitely unless max_attempts is given.
+    """
+    delay = FLOW_EXECUTION_RETRY_DELAY
+    attempt = 0
+    while batch:
+        attempt += 1
+        try:
+            await asyncio.to_thread(FlowExecutions.insert_executions, batch)
+            return
+        except IntegrityError:
+            # One bad row fails the whole executemany
+            batch = await _write_rows(batch)
+            if not batch:
+                return
+        except Exception as e:
+            log.warning(f"Failed to save {len(batch)} flow executions: {e}")
+
+        if max_attempts is not None and attempt >= max_attempts:
+            log.error(f"Giving up on saving {len(batch)} flow executions")
+            return
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, FLOW_EXECUTION_MAX_RETRY_DELAY)
+
+
+async def flow_execution_writer():
+    while True:
+        batch = [await _queue.get()]
+        # Everything that queued up meanwhile goes into the same commit
+        _drain_batch(batch)
+        try:
+            await _write_batch(batch)
+        except asyncio.CancelledError:
+            # Stopping mid-write or mid-retry; hand the batch to the shutdown
+            # flush (rows that did get saved fail there as duplicates and are
+            # skipped)
+            _unwritten.extend(batch)
+            raise
+
+
+def start_flow_execution_writer():
+    global _queue, _writer_task
+
+    _queue = asyncio.Queue(maxsize=FLOW_EXECUTION_QUEUE_SIZE)
+    _writer_task = asyncio.create_task(flow_execution_writer())
+    log.info("Flow execution writer started")
+
+
+async def stop_flow_execution_writer():
+    global _writer_task
+
+    if _writer_task is None:
+        return
+
+    _writer_task.cancel()
+    try:
+        await _writer_task
+    except asyncio.CancelledError:
+        pass
+    _writer_task = None
+
+    # Flush whatever is still queued before shutting down
+    if _unwritten:
+        await _write_batch(_unwritten[:], FLOW_EXECUTION_SHUTDOWN_ATTEMPTS)
+        _unwritten.clear()
+
+    while not _queue.empty():
+        batch = []
+        _drain_batch(batch)
+        await _write_batch(batch, FLOW_EXECUTION_SHUTDOWN_ATTEMPTS)
+
+    log.info("Flow execution writer stopped")
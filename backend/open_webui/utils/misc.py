@@ -11,6 +11,7 @@ import json
 
 
 import collections.abc
+from fastapi import Request
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
@@ -26,6 +27,16 @@ def deep_update(d, u):
     return d
 
 
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match matches etag (for a 304 response)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        tag.strip() for tag in if_none_match.split(",")
+    )
+
+
 def get_message_list(messages_map, message_id):
     """
     Reconstructs a list of messages in order up to the specified message_id.
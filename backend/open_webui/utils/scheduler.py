@@ -13,6 +13,7 @@ import re
 import time
 import uuid
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from zoneinfo import ZoneInfo
 
@@ -25,7 +26,7 @@ from open_webui.models.scheduled_prompts import (
     ScheduledPromptUpdateForm,
 )
 from open_webui.models.chats import Chats, ChatForm
-from open_webui.models.users import Users
+from open_webui.models.users import UserModel, Users
 from open_webui.utils.auth import create_token
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -42,11 +43,44 @@ SCHEDULER_CHECK_INTERVAL = 60
 # Max concurrent prompt executions
 _execution_semaphore = asyncio.Semaphore(5)
 
-
+# Response-inspection patterns, compiled once rather than on every run
+_NOTE_ID_PATTERN = re.compile(
+    r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+)
+# Markers of malformed tool-call chatter, matched against lowercased content
+_TOOL_CHATTER_MARKER_PATTERN = re.compile(r"to=|tool[ _]call|arguments|json")
+_TOOL_CHATTER_PREFIX_PATTERN = re.compile(
+    r"(?:\bto=[^\s]+(?:\s+commentary)?(?:\s+[^\s]{1,30})?\s*){2,}", re.IGNORECASE
+)
+_PARAGRAPH_BREAK_PATTERN = re.compile(r"\n{2,}")
+_WHITESPACE_RUN_PATTERN = re.compile(r"\s{2,}")
+
+# Prompts whose last auto-mode run ended in tool_calls without final text and
+# needed the function_calling=default retry. Their next runs start in default
+# mode and skip the wasted round-trip; entries expire so auto mode is tried
+# again eventually, and are keyed on the model and tools so edits reset them
+AUTO_MODE_FALLBACK_TTL = 24 * 60 * 60
+AUTO_MODE_FALLBACK_MAX_SIZE = 1024
+_auto_mode_fallbacks: dict[tuple, float] = {}
+
+# Per-request timeouts: completions can run tools, so they get much longer
+CHAT_COMPLETION_TIMEOUT = aiohttp.ClientTimeout(total=300)
+NTFY_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# HTTP session shared by completion calls and ntfy notifications, so
+# back-to-back runs reuse pooled keep-alive connections instead of paying
+# connection and TLS setup every time. Bound to the loop it was created on
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_http_session_close_tasks: set[asyncio.Task] = set()
+
+
+@lru_cache(maxsize=1024)
 def validate_cron_expression(cron_expression: str) -> bool:
     """
     Validate a cron expression.
     Returns True if valid, False otherwise.
+    Cached, the answer for a given expression never changes.
     """
     try:
         # croniter expects 5 fields: minute hour day month weekday
@@ -56,15 +90,24 @@ def validate_cron_expression(cron_expression: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=256)
+def get_timezone(timezone: str) -> ZoneInfo:
+    """
+    Resolve a timezone name, falling back to UTC for unknown names.
+    Cached so an invalid name doesn't fail the tzdata lookup on every call.
+    """
+    try:
+        return ZoneInfo(timezone)
+    except Exception:
+        return ZoneInfo("UTC")
+
+
 def calculate_next_run(cron_expression: str, timezone: str = "UTC") -> int:
     """
     Calculate the next run time for a cron expression.
     Returns Unix timestamp.
     """
-    try:
-        tz = ZoneInfo(timezone)
-    except Exception:
-        tz = ZoneInfo("UTC")
+    tz = get_timezone(timezone)
     
     now = datetime.now(tz)
     cron = croniter(cron_expression, now)
@@ -103,6 +146,15 @@ def get_cron_description(cron_expression: str) -> str:
         return cron_expression
 
 
+@lru_cache(maxsize=32)
+def normalize_webui_base_url(raw_url: str) -> str:
+    """
+    Normalize a configured WEBUI_URL (no surrounding whitespace or trailing slash).
+    Cached, since WEBUI_URL is effectively constant.
+    """
+    return raw_url.strip().rstrip("/")
+
+
 def get_webui_base_url(app) -> Optional[str]:
     """
     Get configured public WebUI URL from app config.
@@ -110,7 +162,7 @@ def get_webui_base_url(app) -> Optional[str]:
     """
     config = getattr(getattr(app, "state", None), "config", None)
     raw_url = getattr(config, "WEBUI_URL", "") if config else ""
-    base_url = str(raw_url or "").strip().rstrip("/")
+    base_url = normalize_webui_base_url(str(raw_url or ""))
 
     if not base_url:
         log.debug(
@@ -131,6 +183,62 @@ def build_webui_url(app, path: str) -> Optional[str]:
     return f"{base_url}{normalized_path}"
 
 
+async def _close_stale_http_session(session: aiohttp.ClientSession) -> None:
+    try:
+        await session.close()
+    except Exception as e:
+        # Its transports may belong to a loop that is already closed
+        log.debug(f"Failed to close stale scheduler HTTP session: {e}")
+
+
+def _discard_http_session(
+    session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """
+    Close a session left over from another event loop before it is replaced,
+    so its connector and sockets are not leaked. It is closed on its own loop
+    while that is still running, otherwise from the current one.
+    """
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+
+    task = asyncio.get_running_loop().create_task(_close_stale_http_session(session))
+    # Keep a reference until it is done, the loop only holds a weak one
+    _http_session_close_tasks.add(task)
+    task.add_done_callback(_http_session_close_tasks.discard)
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """The shared scheduler HTTP session, created on first use in this loop."""
+    global _http_session, _http_session_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        if _http_session is not None and not _http_session.closed:
+            _discard_http_session(_http_session, _http_session_loop)
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100, keepalive_timeout=60, ttl_dns_cache=300
+            )
+        )
+        _http_session_loop = loop
+    return _http_session
+
+
+async def close_http_session():
+    """
+    Close the shared scheduler HTTP session.
+    Called from FastAPI lifespan shutdown.
+    """
+    global _http_session, _http_session_loop
+
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+
 def get_chat_completions_api_urls(app) -> list[str]:
     """Get ordered API URL candidates for chat completions."""
     candidates: list[str] = []
@@ -210,9 +318,6 @@ def extract_note_attachments_from_sources(sources: list) -> list[dict]:
 def extract_note_ids_from_list_sources(sources: list) -> list[str]:
     """Extract note IDs from note listing/search citation documents."""
     note_ids: list[str] = []
-    uuid_pattern = re.compile(
-        r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
-    )
 
     for source in sources or []:
         source_name = str(source.get("source", {}).get("name", ""))
@@ -226,7 +331,7 @@ def extract_note_ids_from_list_sources(sources: list) -> list[str]:
             if not isinstance(document, str):
                 continue
 
-            for match in uuid_pattern.findall(document):
+            for match in _NOTE_ID_PATTERN.findall(document):
                 if match not in note_ids:
                     note_ids.append(match)
 
@@ -271,7 +376,9 @@ def sanitize_tool_chatter_text(content: str, action_tools: list[str]) -> str:
     if "to=" not in lowered or not any(tool in lowered for tool in tool_mentions):
         return content
 
-    blocks = [block.strip() for block in re.split(r"\n{2,}", content) if block.strip()]
+    blocks = [
+        block.strip() for block in _PARAGRAPH_BREAK_PATTERN.split(content) if block.strip()
+    ]
     if len(blocks) > 1:
         for block in reversed(blocks):
             block_lower = block.lower()
@@ -281,33 +388,31 @@ def sanitize_tool_chatter_text(content: str, action_tools: list[str]) -> str:
                 continue
             return block
 
-    cleaned = re.sub(
-        r"(?:\bto=[^\s]+(?:\s+commentary)?(?:\s+[^\s]{1,30})?\s*){2,}",
-        "",
-        content,
-        flags=re.IGNORECASE,
-    )
-    cleaned = re.sub(r"\s{2,}", " ", cleaned).strip()
+    cleaned = _TOOL_CHATTER_PREFIX_PATTERN.sub("", content)
+    cleaned = _WHITESPACE_RUN_PATTERN.sub(" ", cleaned).strip()
     return cleaned or content
 
 
-async def execute_scheduled_prompt(app, prompt: ScheduledPromptModel) -> dict:
+async def execute_scheduled_prompt(
+    app, prompt: ScheduledPromptModel, user: Optional[UserModel] = None
+) -> dict:
     """
     Execute a single scheduled prompt.
     
     Args:
         app: FastAPI application instance (for accessing models and config)
         prompt: The scheduled prompt to execute
+        user: The prompt's owner, if the caller already loaded it
     
     Returns:
         dict with execution result including chat_id
     """
     log.info(f"[Scheduler] Executing scheduled prompt: {prompt.id} - {prompt.name}")
-    user = None
     
     try:
         # Get the user who owns this prompt
-        user = Users.get_user_by_id(prompt.user_id)
+        if user is None:
+            user = Users.get_user_by_id(prompt.user_id)
         if not user:
             raise Exception(f"User {prompt.user_id} not found")
         
@@ -386,6 +491,17 @@ async def execute_scheduled_prompt(app, prompt: ScheduledPromptModel) -> dict:
         # Exclude prompt_scheduler from execution tools to avoid recursive scheduling calls.
         action_tools = [t for t in (tool_ids or []) if "prompt_scheduler" not in t.lower()]
 
+        auto_mode_key = (prompt.id, model_id, tuple(action_tools))
+        if function_calling_mode == "auto":
+            fallback_at = _auto_mode_fallbacks.get(auto_mode_key)
+            if fallback_at and time.monotonic() - fallback_at < AUTO_MODE_FALLBACK_TTL:
+                log.info(
+                    "[Scheduler] Prompt %s needed the default-mode retry last run; using function_calling=default",
+                    prompt.id,
+                )
+                function_calling_mode = "default"
+                payload["params"] = {"function_calling": "default"}
+
         if tool_ids:
             if action_tools:
                 payload["tool_ids"] = action_tools
@@ -440,17 +556,16 @@ async def execute_scheduled_prompt(app, prompt: ScheduledPromptModel) -> dict:
 
             for index, candidate_api_url in enumerate(api_urls):
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            candidate_api_url,
-                            headers=headers,
-                            json=request_payload,
-                            timeout=aiohttp.ClientTimeout(total=300),
-                        ) as response:
-                            if response.status != 200:
-                                error_text = await response.text()
-                                raise Exception(f"API error {response.status}: {error_text}")
-                            return await response.json()
+                    async with get_http_session().post(
+                        candidate_api_url,
+                        headers=headers,
+                        json=request_payload,
+                        timeout=CHAT_COMPLETION_TIMEOUT,
+                    ) as response:
+                        if response.status != 200:
+                            error_text = await response.text()
+                            raise Exception(f"API error {response.status}: {error_text}")
+                        return await response.json()
                 except (
                     aiohttp.ClientConnectionError,
                     aiohttp.ClientConnectorError,
@@ -512,6 +627,13 @@ async def execute_scheduled_prompt(app, prompt: ScheduledPromptModel) -> dict:
                     or ""
                 )
 
+                if function_calling_mode == "auto" and assistant_content:
+                    _auto_mode_fallbacks.pop(auto_mode_key, None)
+                    if len(_auto_mode_fallbacks) >= AUTO_MODE_FALLBACK_MAX_SIZE:
+                        # Evict the oldest entry
+                        _auto_mode_fallbacks.pop(next(iter(_auto_mode_fallbacks)))
+                    _auto_mode_fallbacks[auto_mode_key] = time.monotonic()
+
             if not assistant_content:
                 assistant_content = (
                     "Scheduled prompt completed, but the model returned only tool calls and no final text."
@@ -571,22 +693,14 @@ async def execute_scheduled_prompt(app, prompt: ScheduledPromptModel) -> dict:
                 assistant_content = continuation_content
                 response_data = continuation_response
 
+        # Chatter mentions a configured tool alongside tool-call syntax
+        # ("to=", "tool call", "arguments", "json", ...)
         assistant_content_lower = (assistant_content or "").lower()
-        chatter_markers = [
-            "to=",
-            "tool call",
-            "tool_call",
-            "arguments",
-            "need proper json",
-            "do not output json",
-            "json",
-        ]
         mentions_configured_tool = any(
             tool_id.lower() in assistant_content_lower for tool_id in action_tools
         )
-        has_malformed_tool_chatter = (
-            any(marker in assistant_content_lower for marker in chatter_markers)
-            and mentions_configured_tool
+        has_malformed_tool_chatter = mentions_configured_tool and bool(
+            _TOOL_CHATTER_MARKER_PATTERN.search(assistant_content_lower)
         )
 
         if has_malformed_tool_chatter and action_tools:
@@ -879,32 +993,35 @@ async def execute_scheduled_prompt(app, prompt: ScheduledPromptModel) -> dict:
         if output_preview:
             ntfy_message = f"{ntfy_message}\n\nOutput:\n{output_preview}"
         
-        await send_user_notification(
-            prompt.user_id,
-            {
-                "type": "scheduled_prompt",
-                "status": "success",
-                "title": f"Scheduled prompt completed",
-                "message": notification_message,
-                "chat_id": chat_id,
-                "chat_url": chat_url,
-                "scheduled_prompts_url": scheduled_prompts_url,
-                "prompt_id": prompt.id,
-            }
-        )
-
-        await send_ntfy_notification(
-            user,
-            {
-                "status": "success",
-                "title": "Scheduled prompt completed",
-                "message": ntfy_message,
-                "prompt_name": prompt.name,
-                "prompt_id": prompt.id,
-                "chat_id": chat_id,
-                "chat_url": chat_url,
-                "scheduled_prompts_url": scheduled_prompts_url,
-            },
+        # The websocket and ntfy notifications are independent; send them
+        # concurrently (both log and swallow their own failures)
+        await asyncio.gather(
+            send_user_notification(
+                prompt.user_id,
+                {
+                    "type": "scheduled_prompt",
+                    "status": "success",
+                    "title": f"Scheduled prompt completed",
+                    "message": notification_message,
+                    "chat_id": chat_id,
+                    "chat_url": chat_url,
+                    "scheduled_prompts_url": scheduled_prompts_url,
+                    "prompt_id": prompt.id,
+                },
+            ),
+            send_ntfy_notification(
+                user,
+                {
+                    "status": "success",
+                    "title": "Scheduled prompt completed",
+                    "message": ntfy_message,
+                    "prompt_name": prompt.name,
+                    "prompt_id": prompt.id,
+                    "chat_id": chat_id,
+                    "chat_url": chat_url,
+                    "scheduled_prompts_url": scheduled_prompts_url,
+                },
+            ),
         )
         
         return {
@@ -947,28 +1064,29 @@ async def execute_scheduled_prompt(app, prompt: ScheduledPromptModel) -> dict:
                 f"http://127.0.0.1:{port}/workspace/scheduled-prompts"
             )
 
-        await send_user_notification(
-            prompt.user_id,
-            {
-                "type": "scheduled_prompt",
-                "status": "error",
-                "title": "Scheduled prompt failed",
-                "message": f"'{prompt.name}' failed: {str(e)[:200]}",
-                "prompt_id": prompt.id,
-                "scheduled_prompts_url": scheduled_prompts_url,
-            }
-        )
-
-        await send_ntfy_notification(
-            user,
-            {
-                "status": "error",
-                "title": "Scheduled prompt failed",
-                "message": f"'{prompt.name}' failed: {str(e)[:200]}",
-                "prompt_name": prompt.name,
-                "prompt_id": prompt.id,
-                "scheduled_prompts_url": scheduled_prompts_url,
-            },
+        await asyncio.gather(
+            send_user_notification(
+                prompt.user_id,
+                {
+                    "type": "scheduled_prompt",
+                    "status": "error",
+                    "title": "Scheduled prompt failed",
+                    "message": f"'{prompt.name}' failed: {str(e)[:200]}",
+                    "prompt_id": prompt.id,
+                    "scheduled_prompts_url": scheduled_prompts_url,
+                },
+            ),
+            send_ntfy_notification(
+                user,
+                {
+                    "status": "error",
+                    "title": "Scheduled prompt failed",
+                    "message": f"'{prompt.name}' failed: {str(e)[:200]}",
+                    "prompt_name": prompt.name,
+                    "prompt_id": prompt.id,
+                    "scheduled_prompts_url": scheduled_prompts_url,
+                },
+            ),
         )
         
         raise
@@ -993,10 +1111,22 @@ async def scheduler_loop(app):
             if due_prompts:
                 log.info(f"[Scheduler] Found {len(due_prompts)} due prompt(s)")
             
+            # Load every owner in one query rather than one per prompt
+            owners = (
+                {
+                    user.id: user
+                    for user in Users.get_users_by_user_ids(
+                        list({p.user_id for p in due_prompts})
+                    )
+                }
+                if due_prompts
+                else {}
+            )
+
             # Execute prompts concurrently with a semaphore to limit parallelism
             async def _run_with_semaphore(p):
                 async with _execution_semaphore:
-                    await execute_scheduled_prompt(app, p)
+                    await execute_scheduled_prompt(app, p, owners.get(p.user_id))
             
             tasks = [asyncio.create_task(_run_with_semaphore(p)) for p in due_prompts]
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -1140,19 +1270,18 @@ async def send_ntfy_notification(user, data: dict):
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                headers=headers,
-                data=message.encode("utf-8"),
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    log.warning(
-                        f"[Scheduler] ntfy notification failed ({response.status}): {error_text}"
-                    )
-                    return
+        async with get_http_session().post(
+            url,
+            headers=headers,
+            data=message.encode("utf-8", "replace"),
+            timeout=NTFY_TIMEOUT,
+        ) as response:
+            if response.status >= 400:
+                error_text = await response.text()
+                log.warning(
+                    f"[Scheduler] ntfy notification failed ({response.status}): {error_text}"
+                )
+                return
 
         log.debug(
             f"[Scheduler] Sent ntfy notification for user {user.id}: {data.get('title')}"